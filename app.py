@@ -1,10 +1,31 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for, session, flash
+from flask import Flask, render_template, request, jsonify, redirect, url_for, session, flash, abort, make_response, Response, stream_with_context
+from markupsafe import Markup
 from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+import base64
+import bcrypt as bcrypt_lib
+import click
+import csv
+import hashlib
+import io
+import json
+import multiprocessing
 import os
+import re
+import secrets
+import threading
+import time
 from functools import wraps
+from collections import deque
+from werkzeug.middleware.proxy_fix import ProxyFix
+from sqlalchemy import inspect as sa_inspect, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import DataError, IntegrityError, OperationalError, ProgrammingError
 
 app = Flask(__name__)
 
@@ -21,6 +42,38 @@ if database_url:
 else:
     app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///prestige_motors.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# In-process catalog cache: max entries per worker and seconds before an entry expires
+app.config['CATALOG_CACHE_SIZE'] = int(os.environ.get('CATALOG_CACHE_SIZE', 512))
+app.config['CATALOG_CACHE_TTL'] = int(os.environ.get('CATALOG_CACHE_TTL', 60))
+# Rendered car-card fragments are keyed by their own content, so they only expire to free memory
+app.config['FRAGMENT_CACHE_SIZE'] = int(os.environ.get('FRAGMENT_CACHE_SIZE', 2048))
+app.config['FRAGMENT_CACHE_TTL'] = int(os.environ.get('FRAGMENT_CACHE_TTL', 3600))
+# Logged-in user snapshots served to Flask-Login without a database round trip
+app.config['IDENTITY_CACHE_SIZE'] = int(os.environ.get('IDENTITY_CACHE_SIZE', 4096))
+app.config['IDENTITY_CACHE_TTL'] = int(os.environ.get('IDENTITY_CACHE_TTL', 30))
+# Each user's favorited car ids, so listing pages can mark hearts without per-card queries
+app.config['FAVORITE_CACHE_SIZE'] = int(os.environ.get('FAVORITE_CACHE_SIZE', 4096))
+app.config['FAVORITE_CACHE_TTL'] = int(os.environ.get('FAVORITE_CACHE_TTL', 30))
+# Cart badge counts read from user.cart_count; writes refresh the entry in the handling worker
+app.config['CART_COUNT_CACHE_SIZE'] = int(os.environ.get('CART_COUNT_CACHE_SIZE', 4096))
+app.config['CART_COUNT_CACHE_TTL'] = int(os.environ.get('CART_COUNT_CACHE_TTL', 30))
+# bcrypt cost factor (also read by Flask-Bcrypt); stored hashes are upgraded on login when it changes
+app.config['BCRYPT_LOG_ROUNDS'] = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
+# Processes per worker that run bcrypt, and how many hashes may wait for them; 0 workers hashes inline
+app.config['PASSWORD_HASH_WORKERS'] = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+app.config['PASSWORD_HASH_MAX_PENDING'] = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 8))
+# Request throttling for auth and JSON API routes; memory:// keeps counters per worker,
+# redis://host:port/db shares them between workers (needs the redis package)
+app.config['RATE_LIMIT_ENABLED'] = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+app.config['RATE_LIMIT_STORAGE_URL'] = os.environ.get('RATE_LIMIT_STORAGE_URL', 'memory://')
+app.config['RATE_LIMIT_MAX_KEYS'] = int(os.environ.get('RATE_LIMIT_MAX_KEYS', 10000))
+# Number of reverse proxies in front of the app whose X-Forwarded-For can be trusted
+app.config['TRUSTED_PROXY_COUNT'] = int(os.environ.get('TRUSTED_PROXY_COUNT', 0))
+# Mixed into page ETags so a deploy with new templates invalidates browser copies
+app.config['ASSET_VERSION'] = os.environ.get('ASSET_VERSION', os.environ.get('RENDER_GIT_COMMIT', ''))
+
+if app.config['TRUSTED_PROXY_COUNT']:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['TRUSTED_PROXY_COUNT'])
 
 # Initialize extensions
 db = SQLAlchemy(app)
@@ -35,6 +88,11 @@ login_manager.login_message = 'Please log in to access this page.'
 
 class User(UserMixin, db.Model):
     """User model for authentication"""
+    __table_args__ = (
+        # Newest-first keyset order of the admin user directory
+        db.Index('ix_user_created_at', 'created_at', 'id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
@@ -43,6 +101,8 @@ class User(UserMixin, db.Model):
     phone = db.Column(db.String(20))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     is_admin = db.Column(db.Boolean, default=False)
+    # Denormalized size of the cart, kept in step by the cart mutation paths
+    cart_count = db.Column(db.Integer, default=0, nullable=False, server_default='0')
     
     # Relationships
     inquiries = db.relationship('Inquiry', backref='user', lazy=True)
@@ -52,9 +112,26 @@ class User(UserMixin, db.Model):
         return f'<User {self.username}>'
 
 
+def new_stock_number():
+    """Random stock number for a car added without one"""
+    return f'PM-{secrets.token_hex(5).upper()}'
+
+
 class Car(db.Model):
     """Car model for vehicle inventory"""
+    __table_args__ = (
+        db.Index('ix_car_status_created_at', 'status', 'created_at'),
+        # Covers the public listing's keyset order; partial where the database supports it
+        db.Index('ix_car_available_created_at', 'created_at', 'id',
+                 postgresql_where=text("status = 'available'"),
+                 sqlite_where=text("status = 'available'")),
+        # Natural key of bulk catalog imports
+        db.Index('ux_car_stock_number', 'stock_number', unique=True),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
+    # Dealer stock number; generated when a car is added without one
+    stock_number = db.Column(db.String(50), default=new_stock_number)
     name = db.Column(db.String(100), nullable=False)
     brand = db.Column(db.String(50), nullable=False)
     model = db.Column(db.String(50), nullable=False)
@@ -65,7 +142,10 @@ class Car(db.Model):
     image_url = db.Column(db.String(500))  # Main image
     status = db.Column(db.String(20), default='available')  # available, sold, reserved
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     discount = db.Column(db.Integer, default=0)  # discount percentage 0-100
+    # Bumped on every change; checkout only reserves the version the buyer saw
+    version = db.Column(db.Integer, default=1, nullable=False, server_default='1')
     
     # Additional specifications
     engine = db.Column(db.String(100))  # e.g., "4.4L V8 Twin-Turbo"
@@ -86,6 +166,11 @@ class Car(db.Model):
     def __repr__(self):
         return f'<Car {self.name}>'
     
+    @property
+    def sale_price(self):
+        """Price after the car's discount, as shown on promo cards"""
+        return self.price * (1 - (self.discount or 0) / 100)
+
     def get_features_list(self):
         """Return features as a list"""
         if self.features:
@@ -108,8 +193,19 @@ class Car(db.Model):
         }
 
 
+@db.event.listens_for(Car, 'before_update')
+def bump_car_version(mapper, connection, car):
+    """Any ORM edit to a car (admin form, gallery change) invalidates versions held by open checkouts"""
+    car.version = (car.version or 0) + 1
+
+
 class CarImage(db.Model):
     """Multiple images for a car"""
+    __table_args__ = (
+        # Gallery lookups and the per-car gallery replace of bulk imports
+        db.Index('ix_car_image_car_id', 'car_id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     car_id = db.Column(db.Integer, db.ForeignKey('car.id'), nullable=False)
     image_url = db.Column(db.String(500), nullable=False)
@@ -123,6 +219,12 @@ class CarImage(db.Model):
 
 class Inquiry(db.Model):
     """Contact form inquiries"""
+    __table_args__ = (
+        db.Index('ix_inquiry_created_at', 'created_at'),
+        db.Index('ix_inquiry_user_created_at', 'user_id', 'created_at'),
+        db.Index('ix_inquiry_status_created_at', 'status', 'created_at'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
     car_id = db.Column(db.Integer, db.ForeignKey('car.id'), nullable=True)
@@ -140,6 +242,10 @@ class Inquiry(db.Model):
 
 class Favorite(db.Model):
     """User's favorite cars"""
+    __table_args__ = (
+        db.Index('uq_favorite_user_car', 'user_id', 'car_id', unique=True),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     car_id = db.Column(db.Integer, db.ForeignKey('car.id'), nullable=False)
@@ -151,6 +257,10 @@ class Favorite(db.Model):
 
 class CartItem(db.Model):
     """Shopping cart items"""
+    __table_args__ = (
+        db.Index('uq_cart_item_user_car', 'user_id', 'car_id', unique=True),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     car_id = db.Column(db.Integer, db.ForeignKey('car.id'), nullable=False)
@@ -164,13 +274,82 @@ class CartItem(db.Model):
         return f'<CartItem User:{self.user_id} Car:{self.car_id}>'
 
 
+class Order(db.Model):
+    """A completed checkout"""
+    # "order" is a reserved word in SQL
+    __tablename__ = 'orders'
+    __table_args__ = (
+        db.Index('ix_orders_status_created_at', 'status', 'created_at'),
+        db.Index('ix_orders_created_at', 'created_at'),
+        db.Index('ix_orders_user_created_at', 'user_id', 'created_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    full_name = db.Column(db.String(100), nullable=False)
+    email = db.Column(db.String(120), nullable=False)
+    phone = db.Column(db.String(20))
+    address = db.Column(db.String(200), nullable=False)
+    city = db.Column(db.String(100), nullable=False)
+    notes = db.Column(db.Text)
+    payment_method = db.Column(db.String(20), nullable=False)  # cash, card
+    card_last4 = db.Column(db.String(4))
+    total = db.Column(db.Float, nullable=False)
+    status = db.Column(db.String(20), default='pending')  # pending, confirmed, completed, cancelled
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Relationships
+    user = db.relationship('User', backref=db.backref('orders', lazy=True))
+    items = db.relationship('OrderItem', backref='order', lazy=True, cascade='all, delete-orphan')
+
+    @property
+    def number(self):
+        """Customer-facing order number"""
+        return f'PM-{self.id}{self.created_at.strftime("%Y%m%d")}'
+
+    def __repr__(self):
+        return f'<Order {self.id} by User:{self.user_id}>'
+
+
+class OrderItem(db.Model):
+    """A car in an order, with its name and price as they were at checkout"""
+    __table_args__ = (
+        db.Index('ix_order_item_order_id', 'order_id'),
+        db.Index('ix_order_item_car_id', 'car_id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False)
+    # Nullable so the order history survives the car being deleted
+    car_id = db.Column(db.Integer, db.ForeignKey('car.id'), nullable=True)
+    car_name = db.Column(db.String(100), nullable=False)
+    price = db.Column(db.Float, nullable=False)
+    discount = db.Column(db.Integer, default=0)
+
+    # Relationships
+    car = db.relationship('Car', backref=db.backref('order_items', lazy=True))
+
+    def __repr__(self):
+        return f'<OrderItem Order:{self.order_id} Car:{self.car_id}>'
+
+
+class StatCounter(db.Model):
+    """Dashboard counters kept up to date by the write paths, one row per (metric, key)"""
+    metric = db.Column(db.String(50), primary_key=True)  # e.g. cars_by_status
+    key = db.Column(db.String(100), primary_key=True, default='')  # e.g. available; '' for plain totals
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<StatCounter {self.metric}[{self.key}]={self.value}>'
+
+
 # ============================================
 # LOGIN MANAGER
 # ============================================
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    return get_identity(int(user_id))
 
 
 # ============================================
@@ -198,6 +377,1314 @@ def api_login_required(f):
     return decorated_function
 
 
+# ============================================
+# PAGINATION HELPERS
+# ============================================
+
+CATALOG_PAGE_SIZE = 12
+CATALOG_MAX_PAGE_SIZE = 48
+# Largest value of an INTEGER primary key; bigger ids from clients cannot be bound to a query
+MAX_ROW_ID = 2**31 - 1
+
+
+def encode_cursor(row):
+    """Encode a row's (created_at, id) keyset position as an opaque URL-safe token"""
+    raw = f"{row.created_at.isoformat()}|{row.id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decode a cursor token into (created_at, id), or None if it is missing or malformed"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8')
+        created_at, row_id = raw.rsplit('|', 1)
+        created_at, row_id = datetime.fromisoformat(created_at), int(row_id)
+    except ValueError:
+        return None
+    if not 1 <= row_id <= MAX_ROW_ID:
+        return None
+    return created_at, row_id
+
+
+def get_page_size():
+    """Read ?per_page= from the request, capped at CATALOG_MAX_PAGE_SIZE"""
+    per_page = request.args.get('per_page', CATALOG_PAGE_SIZE, type=int) or CATALOG_PAGE_SIZE
+    return max(1, min(per_page, CATALOG_MAX_PAGE_SIZE))
+
+
+def newest_first(query, model, cursor=None):
+    """Order a query on model's (created_at, id), newest first, starting after cursor"""
+    position = decode_cursor(cursor)
+    if position:
+        created_at, row_id = position
+        query = query.filter(db.or_(
+            model.created_at < created_at,
+            db.and_(model.created_at == created_at, model.id < row_id)
+        ))
+    return query.order_by(model.created_at.desc(), model.id.desc())
+
+
+def paginate_newest(query, model, cursor=None, per_page=CATALOG_PAGE_SIZE):
+    """Keyset-paginate a query on model's (created_at, id), newest first.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    rows = newest_first(query, model, cursor).limit(per_page + 1).all()
+    next_cursor = encode_cursor(rows[per_page - 1]) if len(rows) > per_page else None
+    return rows[:per_page], next_cursor
+
+
+def paginate_cars(query, cursor=None, per_page=CATALOG_PAGE_SIZE):
+    """Keyset-paginate a Car query on (created_at, id), newest first"""
+    return paginate_newest(query, Car, cursor, per_page)
+
+
+CAR_SORT_ORDERS = {
+    'default': (Car.discount.desc(), Car.created_at.desc()),
+    'discount-desc': (Car.discount.desc(),),
+    'price-asc': (Car.price.asc(),),
+    'price-desc': (Car.price.desc(),),
+    'name-asc': (Car.name.asc(),),
+}
+
+
+def filter_cars(args):
+    """Build a Car query from brand, status, min_discount, min_price, max_price and sort args"""
+    query = Car.query
+
+    brand = args.get('brand')
+    if brand and brand != 'all':
+        query = query.filter(Car.brand == brand)
+
+    status = args.get('status')
+    if status and status != 'all':
+        query = query.filter(Car.status == status)
+
+    min_discount = args.get('min_discount', type=int)
+    if min_discount:
+        query = query.filter(Car.discount >= min_discount)
+
+    min_price = args.get('min_price', type=float)
+    if min_price is not None:
+        query = query.filter(Car.price >= min_price)
+
+    max_price = args.get('max_price', type=float)
+    if max_price is not None:
+        query = query.filter(Car.price <= max_price)
+
+    order = CAR_SORT_ORDERS.get(args.get('sort'), CAR_SORT_ORDERS['default'])
+    return query.order_by(*order, Car.id.desc())
+
+
+CAR_FILTER_ARGS = ('brand', 'status', 'min_discount', 'min_price', 'max_price', 'sort')
+
+
+# ============================================
+# CATALOG CACHE
+# ============================================
+
+class LRUCache:
+    """In-process LRU cache with a per-entry TTL and a version number.
+
+    Entries are keyed by the current version, so bump_version() makes every
+    cached value stale at once; the catalog cache bumps it from every admin
+    write path. Each worker process holds its own caches, and the TTL bounds
+    how long another worker can keep serving a value that predates a write.
+    """
+
+    def __init__(self, max_entries=512, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key, loader):
+        """Return the cached value for key, calling loader() on a miss.
+        None results are returned to the caller but never cached.
+        """
+        now = time.monotonic()
+        with self._lock:
+            cache_key = (self.version, key)
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = loader()
+
+        if value is not None:
+            with self._lock:
+                # Drop values loaded while a write bumped the version
+                if cache_key[0] == self.version:
+                    self._entries[cache_key] = (now + self.ttl, value)
+                    self._entries.move_to_end(cache_key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+        return value
+
+    def put(self, key, value):
+        """Store a value the caller already has, e.g. one returned by a write"""
+        with self._lock:
+            cache_key = (self.version, key)
+            self._entries[cache_key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        """Drop a single cached entry, if present"""
+        with self._lock:
+            self._entries.pop((self.version, key), None)
+
+    def bump_version(self):
+        """Invalidate every cached value at once"""
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+    def stats(self):
+        """Return the current version, size and hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'version': self.version,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+
+catalog_cache = LRUCache(app.config['CATALOG_CACHE_SIZE'], app.config['CATALOG_CACHE_TTL'])
+
+
+def detach(cars):
+    """Expunge loaded cars from the session so they can outlive the request in the cache"""
+    for car in cars:
+        db.session.expunge(car)
+    return cars
+
+
+def get_available_cars_page(cursor, per_page):
+    """Cached keyset page of available cars, shared by / and /cars"""
+    def load():
+        cars, next_cursor = paginate_cars(Car.query.filter_by(status='available'), cursor, per_page)
+        return detach(cars), next_cursor
+    return catalog_cache.get_or_load(('available', cursor, per_page), load)
+
+
+def get_filtered_cars_page(args, page, per_page):
+    """Cached (cars, total, has_more) page of filter_cars() results"""
+    def load():
+        pagination = filter_cars(args).paginate(page=page, per_page=per_page, error_out=False)
+        return detach(pagination.items), pagination.total, pagination.has_next
+    filters = tuple(args.get(name) for name in CAR_FILTER_ARGS)
+    return catalog_cache.get_or_load(('filtered', filters, page, per_page), load)
+
+
+def get_brands():
+    """Cached sorted list of distinct car brands"""
+    def load():
+        return [b[0] for b in db.session.query(Car.brand).distinct().order_by(Car.brand).all()]
+    return catalog_cache.get_or_load('brands', load)
+
+
+def get_car(car_id):
+    """Cached car with its gallery images loaded, or None if it does not exist"""
+    def load():
+        car = Car.query.options(db.selectinload(Car.images)).get(car_id)
+        return detach([car])[0] if car else None
+    return catalog_cache.get_or_load(('car', car_id), load)
+
+
+# ============================================
+# IDENTITY CACHE
+# ============================================
+
+class UserIdentity(UserMixin):
+    """Cached snapshot of the user fields most requests need.
+    Any other User attribute is loaded from the database on first access.
+    """
+
+    def __init__(self, id, username, is_admin, full_name):
+        self.id = id
+        self.username = username
+        self.is_admin = is_admin
+        self.full_name = full_name
+        self._record = None
+
+    @property
+    def record(self):
+        """The full User row, loaded at most once per request"""
+        if self._record is None:
+            self._record = db.session.get(User, self.id)
+        return self._record
+
+    def __getattr__(self, name):
+        # Only reached for attributes the snapshot does not carry
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.record, name)
+
+
+identity_cache = LRUCache(app.config['IDENTITY_CACHE_SIZE'], app.config['IDENTITY_CACHE_TTL'])
+
+
+def get_identity(user_id):
+    """Return a UserIdentity for user_id from the identity cache, or None if the user does not exist"""
+    def load():
+        row = (db.session.query(User.id, User.username, User.is_admin, User.full_name)
+               .filter(User.id == user_id)
+               .first())
+        return tuple(row) if row else None
+    snapshot = identity_cache.get_or_load(user_id, load)
+    # A fresh object per request, so lazily loaded rows never leak between requests
+    return UserIdentity(*snapshot) if snapshot else None
+
+
+def invalidate_identity(user_id):
+    """Forget the cached snapshot after the user's row changes"""
+    identity_cache.discard(user_id)
+
+
+# ============================================
+# FAVORITES CACHE
+# ============================================
+
+favorite_cache = LRUCache(app.config['FAVORITE_CACHE_SIZE'], app.config['FAVORITE_CACHE_TTL'])
+
+
+def get_favorite_ids(user_id):
+    """Frozenset of the car ids user_id has favorited, read with one query on uq_favorite_user_car"""
+    def load():
+        return frozenset(row[0] for row in db.session.query(Favorite.car_id).filter(Favorite.user_id == user_id))
+    return favorite_cache.get_or_load(user_id, load)
+
+
+def invalidate_favorites(user_id):
+    """Forget the cached favorite ids after the user's favorites change"""
+    favorite_cache.discard(user_id)
+
+
+@app.template_global('favorite_car_ids')
+def favorite_car_ids():
+    """The current user's favorited car ids, empty for anonymous visitors"""
+    if not current_user.is_authenticated:
+        return frozenset()
+    return get_favorite_ids(current_user.id)
+
+
+# ============================================
+# PASSWORD HASHING
+# ============================================
+
+def _bcrypt_hash(password, rounds):
+    # bcrypt only uses the first 72 bytes; newer releases reject longer input instead of truncating
+    return bcrypt_lib.hashpw(password.encode('utf-8')[:72], bcrypt_lib.gensalt(rounds)).decode('utf-8')
+
+
+def _bcrypt_check(password_hash, password):
+    return bcrypt_lib.checkpw(password.encode('utf-8')[:72], password_hash.encode('utf-8'))
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many hashes are already queued for the pool, or one times out"""
+
+
+class PasswordHasher:
+    """Runs bcrypt on a small per-worker process pool.
+
+    The pool caps how many CPU cores password hashing can take at once, so a
+    burst of logins cannot starve catalog requests. Work beyond max_pending
+    is rejected with PasswordHasherBusy instead of queueing without bound; a
+    slot stays taken until its job actually finishes, even if the caller gave up.
+    """
+
+    def __init__(self, rounds, workers, max_pending, timeout=30):
+        self.rounds = rounds
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max(max_pending, 1))
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pool_pid = None
+
+    def _get_pool(self):
+        # Created lazily and per process, so forked gunicorn workers never share a pool
+        with self._lock:
+            if self._pool is None or self._pool_pid != os.getpid():
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+                self._pool_pid = os.getpid()
+            return self._pool
+
+    def _run(self, fn, *args):
+        if self.workers <= 0:
+            return fn(*args)
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy()
+        try:
+            future = self._get_pool().submit(fn, *args)
+        except BrokenProcessPool:
+            self._slots.release()
+            return self._run_inline_after_crash(fn, *args)
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # Drops the job if it has not started; a running one keeps its slot until done
+            future.cancel()
+            raise PasswordHasherBusy()
+        except BrokenProcessPool:
+            return self._run_inline_after_crash(fn, *args)
+
+    def _run_inline_after_crash(self, fn, *args):
+        # Replace a crashed pool on the next call; hash inline rather than fail this request
+        with self._lock:
+            self._pool = None
+        return fn(*args)
+
+    def hash(self, password):
+        """Return a bcrypt hash of password at the configured cost"""
+        return self._run(_bcrypt_hash, password, self.rounds)
+
+    def check(self, password_hash, password):
+        """Return True if password matches password_hash"""
+        return self._run(_bcrypt_check, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """Return True if password_hash was made with a different cost than the configured one"""
+        try:
+            return int(password_hash.split('$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+
+password_hasher = PasswordHasher(app.config['BCRYPT_LOG_ROUNDS'],
+                                 app.config['PASSWORD_HASH_WORKERS'],
+                                 app.config['PASSWORD_HASH_MAX_PENDING'])
+
+
+# ============================================
+# RATE LIMITING
+# ============================================
+
+class MemoryRateLimitBackend:
+    """Sliding-window log kept in process memory.
+
+    Each key holds the timestamps of its accepted hits within the window, so
+    a key never stores more than its limit. The least recently used keys are
+    dropped past max_keys. Counters are per worker process.
+    """
+
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self._hits = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key, limit, window):
+        """Record a hit for key; return 0 if allowed, else seconds until a slot frees up"""
+        now = time.monotonic()
+        with self._lock:
+            hits = self._hits.get(key)
+            if hits is None:
+                hits = self._hits[key] = deque()
+            self._hits.move_to_end(key)
+            while hits and hits[0] <= now - window:
+                hits.popleft()
+            if len(hits) >= limit:
+                return hits[0] + window - now
+            hits.append(now)
+            while len(self._hits) > self.max_keys:
+                self._hits.popitem(last=False)
+            return 0
+
+    def reset(self):
+        with self._lock:
+            self._hits.clear()
+
+
+class RedisRateLimitBackend:
+    """Sliding-window log in a Redis sorted set, shared by every worker"""
+
+    # Prune, count and record in one atomic step so concurrent workers cannot overshoot the limit
+    SCRIPT = """
+    local now = tonumber(ARGV[1])
+    local window = tonumber(ARGV[2])
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+    if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[3]) then
+        local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+        return tostring(tonumber(oldest[2]) + window - now)
+    end
+    redis.call('ZADD', KEYS[1], now, ARGV[4])
+    redis.call('PEXPIRE', KEYS[1], math.ceil(window * 1000))
+    return '0'
+    """
+
+    def __init__(self, url):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('RATE_LIMIT_STORAGE_URL points at Redis but the redis package is not installed')
+        self._client = redis.Redis.from_url(url)
+        self._script = self._client.register_script(self.SCRIPT)
+
+    def hit(self, key, limit, window):
+        now = time.time()
+        member = f'{now}:{os.getpid()}:{threading.get_ident()}'
+        return float(self._script(keys=[f'ratelimit:{key}'], args=[now, window, limit, member]))
+
+    def reset(self):
+        for key in self._client.scan_iter('ratelimit:*'):
+            self._client.delete(key)
+
+
+def create_rate_limit_backend(url):
+    """Return the rate limit backend for a storage URL"""
+    if url.startswith(('redis://', 'rediss://')):
+        return RedisRateLimitBackend(url)
+    if url.startswith('memory://'):
+        return MemoryRateLimitBackend(app.config['RATE_LIMIT_MAX_KEYS'])
+    raise RuntimeError(f'Unsupported RATE_LIMIT_STORAGE_URL: {url}')
+
+
+rate_limit_backend = create_rate_limit_backend(app.config['RATE_LIMIT_STORAGE_URL'])
+
+
+def rate_limit(scope, limit, window, per='ip', methods=('POST',), template=None):
+    """Decorator that allows `limit` requests per `window` seconds for each IP or user.
+
+    per='user' keys on the logged-in user and falls back to the IP for
+    anonymous requests; per='email' keys on the submitted email so one
+    account cannot be brute-forced from many addresses. Rejected requests get
+    a 429 with Retry-After: JSON for API routes, otherwise the given template
+    re-rendered with a flash message.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if not app.config['RATE_LIMIT_ENABLED'] or request.method not in methods:
+                return f(*args, **kwargs)
+
+            if per == 'user' and current_user.is_authenticated:
+                ident = f'user:{current_user.id}'
+            elif per == 'email':
+                ident = f"email:{(request.form.get('email') or '').strip().lower()}"
+            else:
+                ident = f'ip:{request.remote_addr}'
+
+            try:
+                retry_after = rate_limit_backend.hit(f'{scope}:{ident}', limit, window)
+            except Exception as e:
+                # A shared backend outage should not take logins down with it
+                print(f"Rate limit backend error: {e}")
+                retry_after = 0
+            if retry_after <= 0:
+                return f(*args, **kwargs)
+
+            retry_after = max(int(retry_after + 0.999), 1)
+            message = f'Too many requests. Please try again in {retry_after} seconds.'
+            if template is None:
+                response = jsonify({'status': 'error', 'message': message})
+            else:
+                flash(message, 'danger')
+                response = make_response(render_template(template))
+            response.status_code = 429
+            response.headers['Retry-After'] = str(retry_after)
+            return response
+        return decorated_function
+    return decorator
+
+
+# ============================================
+# FRAGMENT CACHE
+# ============================================
+
+CAR_CARD_TEMPLATES = {
+    'standard': 'partials/car_card.html',
+    'promo': 'partials/car_card_promo.html',
+}
+
+fragment_cache = LRUCache(app.config['FRAGMENT_CACHE_SIZE'], app.config['FRAGMENT_CACHE_TTL'])
+
+
+def car_card_version(car):
+    """Row version for a card fragment"""
+    return car.updated_at
+
+
+@app.template_global('car_card')
+def car_card(car, variant='standard'):
+    """Render the user-independent part of a car card, reusing cached HTML when the car is unchanged"""
+    template_name = CAR_CARD_TEMPLATES[variant]
+
+    def render():
+        return Markup(app.jinja_env.get_template(template_name).render(car=car))
+    return fragment_cache.get_or_load((variant, car.id, car_card_version(car)), render)
+
+
+# ============================================
+# HTTP CACHING
+# ============================================
+
+def get_catalog_validator():
+    """Cached (latest updated_at, car count) pair identifying the current catalog state"""
+    def load():
+        return db.session.query(db.func.max(Car.updated_at), db.func.count(Car.id)).one()
+    return catalog_cache.get_or_load('validator', load)
+
+
+def conditional_page(render, last_modified, *version_parts):
+    """Serve render() with ETag and Last-Modified validators, answering a
+    matching If-None-Match with a bare 304 before render() is called. The
+    ETag covers the viewer, since pages show login-dependent navigation and
+    favorite state.
+
+    If-Modified-Since alone never gives a 304: the timestamp misses deletes
+    and the viewer's cart and favorites, which only the ETag reflects.
+    """
+    if current_user.is_authenticated:
+        viewer = f'{current_user.id}:{get_cart_count(current_user.id)}:{sorted(get_favorite_ids(current_user.id))}'
+    else:
+        viewer = 'anonymous'
+    stamp = last_modified.isoformat() if last_modified else ''
+    raw = '|'.join(str(part) for part in (app.config['ASSET_VERSION'], viewer, stamp) + version_parts)
+    etag = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+    if last_modified:
+        last_modified = last_modified.replace(microsecond=0, tzinfo=timezone.utc)
+
+    fresh = bool(request.if_none_match) and request.if_none_match.contains(etag)
+
+    response = app.response_class(status=304) if fresh else make_response(render())
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    response.headers['Cache-Control'] = 'private, no-cache' if current_user.is_authenticated else 'no-cache'
+    response.vary.add('Cookie')
+    return response
+
+
+# ============================================
+# SEARCH INDEX
+# ============================================
+
+# Weighted tsvector over the searchable car columns; the GIN index and the
+# search query must use this exact expression for PostgreSQL to use the index
+PG_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(car.name, '') || ' ' || coalesce(car.brand, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(car.model, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(car.features, '')), 'C') || "
+    "setweight(to_tsvector('english', coalesce(car.description, '')), 'D')"
+)
+
+SEARCH_COLUMNS = ('name', 'brand', 'model', 'description', 'features')
+SEARCH_MAX_TERMS = 8
+
+_search_backend = None
+
+
+def ensure_search_index(conn):
+    """Create the full-text index for the current database if it is missing.
+
+    SQLite gets an external-content FTS5 table kept in sync with car by
+    triggers, so admin create, edit and delete (and seeding) update it in
+    the same transaction. PostgreSQL gets a GIN expression index, which the
+    database maintains itself.
+    """
+    global _search_backend
+    dialect = conn.dialect.name
+
+    if dialect == 'sqlite':
+        try:
+            with conn.begin_nested():
+                had_triggers = conn.execute(text(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'car_fts_ai'"
+                )).first() is not None
+                conn.execute(text(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS car_fts USING fts5("
+                    "name, brand, model, description, features, "
+                    "content='car', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+                ))
+                conn.execute(text(
+                    "CREATE TRIGGER IF NOT EXISTS car_fts_ai AFTER INSERT ON car BEGIN "
+                    "INSERT INTO car_fts(rowid, name, brand, model, description, features) "
+                    "VALUES (new.id, new.name, new.brand, new.model, new.description, new.features); END"
+                ))
+                conn.execute(text(
+                    "CREATE TRIGGER IF NOT EXISTS car_fts_ad AFTER DELETE ON car BEGIN "
+                    "INSERT INTO car_fts(car_fts, rowid, name, brand, model, description, features) "
+                    "VALUES ('delete', old.id, old.name, old.brand, old.model, old.description, old.features); END"
+                ))
+                conn.execute(text(
+                    "CREATE TRIGGER IF NOT EXISTS car_fts_au AFTER UPDATE OF name, brand, model, description, features "
+                    "ON car BEGIN "
+                    "INSERT INTO car_fts(car_fts, rowid, name, brand, model, description, features) "
+                    "VALUES ('delete', old.id, old.name, old.brand, old.model, old.description, old.features); "
+                    "INSERT INTO car_fts(rowid, name, brand, model, description, features) "
+                    "VALUES (new.id, new.name, new.brand, new.model, new.description, new.features); END"
+                ))
+                # Triggers are dropped along with the car table, so missing
+                # triggers mean the index may not match the rows any more
+                if not had_triggers:
+                    conn.execute(text("INSERT INTO car_fts(car_fts) VALUES ('rebuild')"))
+                    print("Search index: built FTS5 index for car table.")
+            _search_backend = 'fts5'
+        except OperationalError as e:
+            # SQLite builds without FTS5 fall back to LIKE matching
+            print(f"Search index unavailable, falling back to LIKE search: {e}")
+            _search_backend = 'like'
+
+    elif dialect == 'postgresql':
+        conn.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_car_search ON car USING GIN (({PG_SEARCH_VECTOR}))"
+        ))
+        _search_backend = 'postgresql'
+
+    else:
+        _search_backend = 'like'
+
+
+def get_search_backend():
+    """Return 'fts5', 'postgresql' or 'like' for the current database"""
+    global _search_backend
+    if _search_backend is None:
+        dialect = db.engine.dialect.name
+        if dialect == 'sqlite':
+            has_index = db.session.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE name = 'car_fts'"
+            )).first() is not None
+            _search_backend = 'fts5' if has_index else 'like'
+        elif dialect == 'postgresql':
+            _search_backend = 'postgresql'
+        else:
+            _search_backend = 'like'
+    return _search_backend
+
+
+def search_terms(query):
+    """Split a free-text query into lowercase word tokens safe to embed in MATCH/tsquery syntax"""
+    return re.findall(r'\w+', (query or '').lower())[:SEARCH_MAX_TERMS]
+
+
+def search_cars(query, page=1, per_page=CATALOG_PAGE_SIZE):
+    """Ranked full-text search over name, brand, model, description and features.
+    Every term must match, as a prefix. Returns (cars, has_more).
+    """
+    terms = search_terms(query)
+    if not terms:
+        return [], False
+
+    offset = (page - 1) * per_page
+    backend = get_search_backend()
+
+    if backend == 'fts5':
+        match = ' '.join(f'"{term}"*' for term in terms)
+        rows = Car.query.from_statement(text(
+            "SELECT car.* FROM car JOIN car_fts ON car_fts.rowid = car.id "
+            "WHERE car_fts MATCH :match "
+            "ORDER BY bm25(car_fts, 10.0, 8.0, 6.0, 1.0, 2.0), car.id "
+            "LIMIT :limit OFFSET :offset"
+        )).params(match=match, limit=per_page + 1, offset=offset).all()
+    elif backend == 'postgresql':
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        rows = Car.query.from_statement(text(
+            f"SELECT car.* FROM car, to_tsquery('english', :tsquery) AS query "
+            f"WHERE ({PG_SEARCH_VECTOR}) @@ query "
+            f"ORDER BY ts_rank(({PG_SEARCH_VECTOR}), query) DESC, car.id "
+            f"LIMIT :limit OFFSET :offset"
+        )).params(tsquery=tsquery, limit=per_page + 1, offset=offset).all()
+    else:
+        q = Car.query
+        for term in terms:
+            pattern = f'%{term}%'
+            q = q.filter(db.or_(*(getattr(Car, column).ilike(pattern) for column in SEARCH_COLUMNS)))
+        rows = q.order_by(Car.id).limit(per_page + 1).offset(offset).all()
+
+    return rows[:per_page], len(rows) > per_page
+
+
+def get_search_page(query, page, per_page):
+    """Cached (cars, has_more) page of search_cars() results"""
+    def load():
+        cars, has_more = search_cars(query, page, per_page)
+        return detach(cars), has_more
+    return catalog_cache.get_or_load(('search', ' '.join(search_terms(query)), page, per_page), load)
+
+
+# ============================================
+# ATOMIC WRITES
+# ============================================
+
+# Dialects whose INSERT supports ON CONFLICT DO NOTHING
+CONFLICT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+
+def insert_user_car(model, user_id, car_id, *car_filters):
+    """Insert a Favorite/CartItem row for user_id and car_id in one statement.
+
+    The row is selected from the car table, so a missing car (or one failing
+    car_filters) inserts nothing, and the (user_id, car_id) unique index
+    turns a duplicate into a no-op. Returns True if a row was inserted.
+    """
+    source = (db.select(db.literal(user_id), Car.id, db.literal(datetime.utcnow(), db.DateTime))
+              .where(Car.id == car_id, *car_filters))
+    columns = ['user_id', 'car_id', 'created_at']
+
+    insert = CONFLICT_INSERTS.get(db.engine.dialect.name)
+    if insert is None:
+        try:
+            with db.session.begin_nested():
+                result = db.session.execute(db.insert(model).from_select(columns, source))
+        except IntegrityError:
+            return False
+        return result.rowcount > 0
+
+    statement = (insert(model).from_select(columns, source)
+                 .on_conflict_do_nothing(index_elements=['user_id', 'car_id']))
+    return db.session.execute(statement).rowcount > 0
+
+
+def delete_user_car(model, user_id, car_id):
+    """Delete the Favorite/CartItem row for user_id and car_id in one statement; return True if one existed"""
+    statement = (db.delete(model)
+                 .where(model.user_id == user_id, model.car_id == car_id)
+                 .execution_options(synchronize_session=False))
+    return db.session.execute(statement).rowcount > 0
+
+
+def insert_user_cars(model, user_id, car_ids, *car_filters):
+    """Batch form of insert_user_car(): one INSERT ... SELECT covering every id in
+    car_ids. Returns the set of car ids that were actually inserted.
+    """
+    insert = CONFLICT_INSERTS.get(db.engine.dialect.name)
+    if insert is None:
+        return {car_id for car_id in car_ids if insert_user_car(model, user_id, car_id, *car_filters)}
+
+    source = (db.select(db.literal(user_id), Car.id, db.literal(datetime.utcnow(), db.DateTime))
+              .where(Car.id.in_(car_ids), *car_filters))
+    statement = (insert(model).from_select(['user_id', 'car_id', 'created_at'], source)
+                 .on_conflict_do_nothing(index_elements=['user_id', 'car_id'])
+                 .returning(model.car_id))
+    return set(db.session.execute(statement).scalars())
+
+
+def delete_user_cars(model, user_id, car_ids):
+    """Batch form of delete_user_car(); returns the set of car ids whose rows were deleted"""
+    condition = db.and_(model.user_id == user_id, model.car_id.in_(car_ids))
+    statement = db.delete(model).where(condition).execution_options(synchronize_session=False)
+    if db.engine.dialect.delete_returning:
+        return set(db.session.execute(statement.returning(model.car_id)).scalars())
+    deleted = set(db.session.execute(db.select(model.car_id).where(condition)).scalars())
+    db.session.execute(statement)
+    return deleted
+
+
+def reserve_cars(expected_versions):
+    """Move each car in {car_id: version} from available to reserved with a
+    conditional UPDATE, in the caller's transaction.
+
+    Rows are updated one at a time in id order, so concurrent checkouts lock
+    cars in the same order and cannot deadlock, and only the rows involved
+    are ever locked. Returns {car_id: reason} for every car that was sold,
+    reserved or edited since its version was read; the caller must roll back
+    if this is not empty.
+    """
+    conflicts = {}
+    now = datetime.utcnow()
+    for car_id in sorted(expected_versions):
+        statement = (db.update(Car)
+                     .where(Car.id == car_id,
+                            Car.status == 'available',
+                            Car.version == expected_versions[car_id])
+                     .values(status='reserved', version=Car.version + 1, updated_at=now)
+                     .execution_options(synchronize_session=False))
+        if db.session.execute(statement).rowcount == 0:
+            conflicts[car_id] = None
+
+    if conflicts:
+        current = dict(db.session.query(Car.id, Car.status).filter(Car.id.in_(conflicts)).all())
+        for car_id in conflicts:
+            status = current.get(car_id)
+            if status is None:
+                conflicts[car_id] = 'This car is no longer listed. Please remove it from your cart.'
+            elif status != 'available':
+                conflicts[car_id] = f'This car has just been {status} by another buyer. Please remove it from your cart.'
+            else:
+                conflicts[car_id] = 'The details of this car changed while you were checking out. Please review them and try again.'
+    else:
+        # Conditional UPDATEs bypass the ORM stats hooks
+        bump_stats(db.session.connection(), {('cars_by_status', 'available'): -len(expected_versions),
+                                             ('cars_by_status', 'reserved'): len(expected_versions)})
+    return conflicts
+
+
+# ============================================
+# DASHBOARD STATS
+# ============================================
+
+# Days of per-day inquiry counts shown on the dashboard
+DASHBOARD_INQUIRY_DAYS = 14
+
+
+def bump_stats(connection, deltas):
+    """Add {(metric, key): delta} to stat_counter on connection, inside the
+    caller's transaction, with one upsert per counter.
+    """
+    table = StatCounter.__table__
+    insert = CONFLICT_INSERTS.get(connection.dialect.name)
+    for (metric, key), delta in deltas.items():
+        if not delta:
+            continue
+        if insert is not None:
+            connection.execute(insert(table)
+                               .values(metric=metric, key=key, value=delta)
+                               .on_conflict_do_update(index_elements=['metric', 'key'],
+                                                      set_={'value': table.c.value + delta}))
+            continue
+        updated = connection.execute(table.update()
+                                     .where(table.c.metric == metric, table.c.key == key)
+                                     .values(value=table.c.value + delta)).rowcount
+        if not updated:
+            connection.execute(table.insert().values(metric=metric, key=key, value=delta))
+
+
+def car_stat_keys(status, brand):
+    """The (metric, key) counters a car with status and brand contributes 1 to"""
+    return [('cars_by_status', status or 'available'), ('cars_by_brand', brand)]
+
+
+def stat_keys(target, get=getattr):
+    """The (metric, key) counters a row contributes 1 to; get(target, attr) reads its values"""
+    if isinstance(target, User):
+        return [('users', ''), ('users_by_role', 'admin' if get(target, 'is_admin') else 'user')]
+    if isinstance(target, Car):
+        return car_stat_keys(get(target, 'status'), get(target, 'brand'))
+    if isinstance(target, Inquiry):
+        created = get(target, 'created_at') or datetime.utcnow()
+        return [('inquiries_by_status', get(target, 'status') or 'new'),
+                ('inquiries_by_day', created.date().isoformat())]
+    if isinstance(target, Order):
+        return [('orders_by_status', get(target, 'status') or 'pending')]
+    return []
+
+
+def previous_value(target, attr):
+    """Value of attr before the pending flush, falling back to the current one"""
+    history = db.inspect(target).attrs[attr].history
+    return history.deleted[0] if history.deleted else getattr(target, attr)
+
+
+def stats_after_insert(mapper, connection, target):
+    bump_stats(connection, {key: 1 for key in stat_keys(target)})
+
+
+def stats_after_delete(mapper, connection, target):
+    bump_stats(connection, {key: -1 for key in stat_keys(target)})
+
+
+def stats_before_update(mapper, connection, target):
+    previous = stat_keys(target, previous_value)
+    current = stat_keys(target)
+    if previous == current:
+        return
+    deltas = {}
+    for key in previous:
+        deltas[key] = deltas.get(key, 0) - 1
+    for key in current:
+        deltas[key] = deltas.get(key, 0) + 1
+    bump_stats(connection, deltas)
+
+
+for counted_model in (User, Car, Inquiry, Order):
+    db.event.listen(counted_model, 'after_insert', stats_after_insert)
+    db.event.listen(counted_model, 'after_delete', stats_after_delete)
+    db.event.listen(counted_model, 'before_update', stats_before_update)
+
+
+def rebuild_stats(conn):
+    """Recompute every counter from the source tables with GROUP BY queries"""
+    table = StatCounter.__table__
+    day = db.func.date(Inquiry.created_at)
+    sources = [
+        ('users', db.select(db.literal(''), db.func.count(User.id))),
+        ('users_by_role', db.select(db.case((User.is_admin == db.true(), 'admin'), else_='user'),
+                                    db.func.count(User.id)).group_by(User.is_admin)),
+        ('cars_by_status', db.select(Car.status, db.func.count(Car.id)).group_by(Car.status)),
+        ('cars_by_brand', db.select(Car.brand, db.func.count(Car.id)).group_by(Car.brand)),
+        ('inquiries_by_status', db.select(Inquiry.status, db.func.count(Inquiry.id)).group_by(Inquiry.status)),
+        ('inquiries_by_day', db.select(day, db.func.count(Inquiry.id)).group_by(day)),
+        ('orders_by_status', db.select(Order.status, db.func.count(Order.id)).group_by(Order.status)),
+    ]
+    rows = []
+    for metric, query in sources:
+        for key, value in conn.execute(query):
+            if value:
+                rows.append({'metric': metric, 'key': str(key) if key is not None else '', 'value': value})
+    conn.execute(table.delete())
+    if rows:
+        conn.execute(table.insert(), rows)
+
+
+def get_dashboard_stats():
+    """Every dashboard counter from a single query on stat_counter's primary key"""
+    cutoff = (datetime.utcnow().date() - timedelta(days=DASHBOARD_INQUIRY_DAYS - 1)).isoformat()
+    rows = (db.session.query(StatCounter.metric, StatCounter.key, StatCounter.value)
+            .filter(db.or_(StatCounter.metric != 'inquiries_by_day', StatCounter.key >= cutoff))
+            .all())
+    stats = {metric: {} for metric in ('users', 'users_by_role', 'cars_by_status', 'cars_by_brand',
+                                       'inquiries_by_status', 'inquiries_by_day', 'orders_by_status')}
+    for metric, key, value in rows:
+        if value:
+            stats.setdefault(metric, {})[key] = value
+    return stats
+
+
+# ============================================
+# CART SUMMARY
+# ============================================
+
+def cart_summary_columns():
+    """Aggregates over the cart_item/car join: item count, subtotal and total discount"""
+    discount_amount = Car.price * db.func.coalesce(Car.discount, 0) / 100.0
+    return db.func.count(CartItem.id), db.func.sum(Car.price), db.func.sum(discount_amount)
+
+
+def make_cart_summary(item_count, subtotal, discount):
+    # SUM over no rows is NULL
+    subtotal = float(subtotal or 0)
+    discount = float(discount or 0)
+    return {
+        'item_count': item_count or 0,
+        'subtotal': subtotal,
+        'discount': discount,
+        'total': subtotal - discount
+    }
+
+
+EMPTY_CART_SUMMARY = make_cart_summary(0, 0, 0)
+
+
+def get_cart_summary(user_id):
+    """Item count, subtotal, total discount and final total of user_id's cart in one aggregate query"""
+    row = (db.session.query(*cart_summary_columns())
+           .select_from(CartItem)
+           .join(Car, Car.id == CartItem.car_id)
+           .filter(CartItem.user_id == user_id)
+           .one())
+    return make_cart_summary(*row)
+
+
+def get_cart(user_id):
+    """Return (cart items with their cars, summary) for user_id from a single
+    query; the summary rides along on every row as window aggregates.
+    """
+    rows = (db.session.query(CartItem, *(column.over() for column in cart_summary_columns()))
+            .join(CartItem.car)
+            .options(db.contains_eager(CartItem.car))
+            .filter(CartItem.user_id == user_id)
+            .order_by(CartItem.created_at, CartItem.id)
+            .all())
+    if not rows:
+        return [], EMPTY_CART_SUMMARY
+    return [row[0] for row in rows], make_cart_summary(*rows[0][1:])
+
+
+# ============================================
+# CART COUNT
+# ============================================
+
+cart_count_cache = LRUCache(app.config['CART_COUNT_CACHE_SIZE'], app.config['CART_COUNT_CACHE_TTL'])
+
+
+def get_cart_count(user_id):
+    """Cached number of items in user_id's cart, read from user.cart_count on a miss"""
+    def load():
+        return db.session.query(User.cart_count).filter(User.id == user_id).scalar()
+    return cart_count_cache.get_or_load(user_id, load) or 0
+
+
+def adjust_cart_count(user_id, delta=None):
+    """Shift user.cart_count by delta, or reset it to 0 when delta is None, in the
+    caller's transaction. Returns the new count; publish it with
+    cache_cart_count() once the transaction commits.
+    """
+    value = 0 if delta is None else User.cart_count + delta
+    statement = db.update(User).where(User.id == user_id).values(cart_count=value)
+    if db.engine.dialect.update_returning:
+        return db.session.execute(statement.returning(User.cart_count)).scalar()
+    db.session.execute(statement)
+    return db.session.query(User.cart_count).filter(User.id == user_id).scalar()
+
+
+def cache_cart_count(user_id, count):
+    """Publish a committed cart count to this worker's cache"""
+    cart_count_cache.put(user_id, count)
+
+
+@app.template_global('cart_count')
+def cart_count_for_viewer():
+    """The current user's cart size for the nav badge, 0 for anonymous visitors"""
+    if not current_user.is_authenticated:
+        return 0
+    return get_cart_count(current_user.id)
+
+
+# ============================================
+# CATALOG IMPORT / EXPORT
+# ============================================
+
+# Column order of exported files; imports accept the same columns
+CAR_TRANSFER_FIELDS = (
+    'stock_number', 'name', 'brand', 'model', 'year', 'price', 'discount', 'status',
+    'horsepower', 'engine', 'transmission', 'fuel_type', 'mileage', 'exterior_color',
+    'interior_color', 'top_speed', 'acceleration', 'description', 'features', 'image_url', 'images',
+)
+CAR_TRANSFER_FORMATS = {'csv': 'text/csv', 'jsonl': 'application/x-ndjson'}
+CAR_REQUIRED_FIELDS = ('stock_number', 'name', 'brand', 'model', 'year', 'price')
+CAR_INT_FIELDS = ('year', 'discount', 'horsepower', 'mileage', 'top_speed')
+CAR_FLOAT_FIELDS = ('price', 'acceleration')
+# Used for blank cells, matching what the admin car form stores
+CAR_IMPORT_DEFAULTS = {'status': 'available', 'discount': 0, 'mileage': 0,
+                       'transmission': 'Automatic', 'fuel_type': 'Petrol'}
+CAR_STATUSES = ('available', 'reserved', 'sold')
+# Gallery URLs share one CSV cell
+CSV_IMAGE_SEPARATOR = '|'
+# Rows written per transaction when importing, and cars loaded per round trip when exporting
+CAR_IMPORT_BATCH_SIZE = 500
+CAR_EXPORT_BATCH_SIZE = 500
+# Row errors kept for the import report; the failed count still covers every row
+CAR_IMPORT_MAX_ERRORS = 200
+
+
+def read_car_records(stream, fmt):
+    """Yield (line number, record dict or None, error) for each row of a CSV or
+    JSONL text stream, reading it lazily.
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for record in reader:
+            if None in record:
+                yield reader.line_num, None, 'More cells than header columns'
+            else:
+                yield reader.line_num, record, None
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, f'Invalid JSON: {e}'
+            continue
+        if isinstance(record, dict):
+            yield line_number, record, None
+        else:
+            yield line_number, None, 'Expected a JSON object'
+
+
+def parse_car_record(record):
+    """Validate one imported record into (car column values, gallery image URLs).
+    Raises ValueError with a message for the import report.
+    """
+    unknown = set(record) - set(CAR_TRANSFER_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown column(s): {', '.join(sorted(unknown))}")
+
+    values = {}
+    for field in CAR_TRANSFER_FIELDS:
+        value = record.get(field)
+        if isinstance(value, str):
+            value = value.strip()
+        if field == 'images':
+            continue
+        if field == 'features' and isinstance(value, list):
+            value = ', '.join(str(item).strip() for item in value if str(item).strip())
+        if value in (None, ''):
+            if field in CAR_REQUIRED_FIELDS:
+                raise ValueError(f'{field} is required')
+            values[field] = CAR_IMPORT_DEFAULTS.get(field)
+            continue
+        try:
+            if field in CAR_INT_FIELDS:
+                value = int(value)
+            elif field in CAR_FLOAT_FIELDS:
+                value = float(value)
+            else:
+                value = str(value)
+        except (TypeError, ValueError):
+            raise ValueError(f'{field} must be a number, got {value!r}')
+        length = getattr(Car.__table__.c[field].type, 'length', None)
+        if length and len(value) > length:
+            raise ValueError(f'{field} is longer than {length} characters')
+        values[field] = value
+
+    if values['status'] not in CAR_STATUSES:
+        raise ValueError(f"status must be one of {', '.join(CAR_STATUSES)}")
+    if not 0 <= values['discount'] <= 100:
+        raise ValueError('discount must be between 0 and 100')
+
+    images = record.get('images') or []
+    if isinstance(images, str):
+        images = images.split(CSV_IMAGE_SEPARATOR)
+    if not isinstance(images, list):
+        raise ValueError('images must be a list of URLs')
+    images = [str(url).strip() for url in images if str(url).strip()]
+    for url in images:
+        if len(url) > CarImage.__table__.c.image_url.type.length:
+            raise ValueError('Image URL is too long')
+    return values, images
+
+
+def write_car_batch(batch):
+    """Create or update the cars in batch, a list of (values, images) with
+    distinct stock numbers, with bulk statements in the current transaction.
+    Each car's gallery is replaced by its images. Returns (created, updated).
+    """
+    cars = Car.__table__
+    gallery = CarImage.__table__
+    now = datetime.utcnow()
+    existing = {row.stock_number: row for row in db.session.execute(
+        db.select(cars.c.id, cars.c.stock_number, cars.c.status, cars.c.brand)
+        .where(cars.c.stock_number.in_([values['stock_number'] for values, _ in batch]))
+        .with_for_update()
+    )}
+
+    # Core statements skip the mapper events, so the stat counters are adjusted here
+    deltas = {}
+    inserts, updates = [], []
+    for values, _ in batch:
+        old = existing.get(values['stock_number'])
+        if old is not None:
+            for key in car_stat_keys(old.status, old.brand):
+                deltas[key] = deltas.get(key, 0) - 1
+            updates.append(dict(values, car_id=old.id, updated_at=now))
+        else:
+            inserts.append(dict(values, created_at=now, updated_at=now))
+        for key in car_stat_keys(values['status'], values['brand']):
+            deltas[key] = deltas.get(key, 0) + 1
+
+    car_ids = {row.stock_number: row.id for row in existing.values()}
+    if inserts:
+        created = db.session.execute(cars.insert().returning(cars.c.id, cars.c.stock_number), inserts)
+        car_ids.update({row.stock_number: row.id for row in created})
+    if updates:
+        db.session.execute(cars.update()
+                           .where(cars.c.id == db.bindparam('car_id'))
+                           .values(version=cars.c.version + 1), updates)
+
+    if updates:
+        db.session.execute(gallery.delete().where(gallery.c.car_id.in_([row['car_id'] for row in updates])))
+    images = [{'car_id': car_ids[values['stock_number']], 'image_url': url, 'order': index,
+               'is_primary': False, 'created_at': now}
+              for values, urls in batch for index, url in enumerate(urls)]
+    if images:
+        db.session.execute(gallery.insert(), images)
+
+    bump_stats(db.session.connection(), deltas)
+    return len(inserts), len(updates)
+
+
+def import_cars(stream, fmt, batch_size=CAR_IMPORT_BATCH_SIZE):
+    """Create or update cars from a CSV or JSONL text stream, keyed on
+    stock_number, committing every batch_size rows. A batch the database
+    rejects is retried row by row so only the offending rows fail.
+    Returns counts of created, updated and failed rows plus the row errors.
+    """
+    report = {'created': 0, 'updated': 0, 'failed': 0, 'errors': []}
+
+    def fail(line, message):
+        report['failed'] += 1
+        if len(report['errors']) < CAR_IMPORT_MAX_ERRORS:
+            report['errors'].append((line, message))
+
+    def flush(batch):
+        rows = list(batch.values())
+        try:
+            with db.session.begin_nested():
+                created, updated = write_car_batch([(values, images) for _, values, images in rows])
+        except (IntegrityError, DataError):
+            created = updated = 0
+            for line, values, images in rows:
+                try:
+                    with db.session.begin_nested():
+                        row_created, row_updated = write_car_batch([(values, images)])
+                except (IntegrityError, DataError) as e:
+                    fail(line, str(e.orig).splitlines()[0])
+                    continue
+                created += row_created
+                updated += row_updated
+        db.session.commit()
+        report['created'] += created
+        report['updated'] += updated
+        batch.clear()
+
+    # Keyed by stock number: a repeat within the file starts a new batch so rows apply in order
+    batch = {}
+    for line, record, error in read_car_records(stream, fmt):
+        if error is None:
+            try:
+                values, images = parse_car_record(record)
+            except ValueError as e:
+                error = str(e)
+        if error is not None:
+            fail(line, error)
+            continue
+        if values['stock_number'] in batch or len(batch) >= batch_size:
+            flush(batch)
+        batch[values['stock_number']] = (line, values, images)
+    if batch:
+        flush(batch)
+
+    if report['created'] or report['updated']:
+        catalog_cache.bump_version()
+    return report
+
+
+def export_cars(fmt):
+    """Generate the whole catalog as CSV or JSONL text chunks, one car per row,
+    loading CAR_EXPORT_BATCH_SIZE cars at a time.
+    """
+    cars = db.session.scalars(db.select(Car)
+                              .options(db.selectinload(Car.images))
+                              .order_by(Car.id)
+                              .execution_options(yield_per=CAR_EXPORT_BATCH_SIZE))
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if fmt == 'csv':
+        writer.writerow(CAR_TRANSFER_FIELDS)
+
+    for car in cars:
+        record = {field: getattr(car, field) for field in CAR_TRANSFER_FIELDS if field != 'images'}
+        images = [image.image_url for image in sorted(car.images, key=lambda image: image.order or 0)]
+        if fmt == 'jsonl':
+            record['features'] = car.get_features_list()
+            record['images'] = images
+            yield json.dumps(record) + '\n'
+            continue
+        record['images'] = CSV_IMAGE_SEPARATOR.join(images)
+        writer.writerow(['' if record[field] is None else record[field] for field in CAR_TRANSFER_FIELDS])
+        if buffer.tell() >= 65536:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
 # ============================================
 # ROUTES - MAIN PAGES
 # ============================================
@@ -205,35 +1692,43 @@ def api_login_required(f):
 @app.route('/')
 def index():
     """Homepage"""
-    cars = Car.query.filter_by(status='available').order_by(Car.created_at.desc()).all()
-    return render_template('index.html', cars=cars)
+    def render():
+        cars, next_cursor = get_available_cars_page(request.args.get('cursor'), get_page_size())
+        return render_template('index.html', cars=cars, next_cursor=next_cursor)
+    return conditional_page(render, *get_catalog_validator())
 
 
 @app.route('/cars')
 def cars():
     """All cars page"""
-    all_cars = Car.query.filter_by(status='available').all()
-    return render_template('cars.html', cars=all_cars)
+    def render():
+        all_cars, next_cursor = get_available_cars_page(request.args.get('cursor'), get_page_size())
+        return render_template('cars.html', cars=all_cars, next_cursor=next_cursor)
+    return conditional_page(render, *get_catalog_validator())
 
 
 @app.route('/black-friday')
 def black_friday():
     """Black Friday promotional page"""
-    all_cars = Car.query.order_by(Car.discount.desc(), Car.created_at.desc()).all()
-    brands = db.session.query(Car.brand).distinct().order_by(Car.brand).all()
-    return render_template('black_friday.html',
-                           cars=all_cars,
-                           brands=[b[0] for b in brands])
+    def render():
+        cars, total, has_more = get_filtered_cars_page(request.args, 1, get_page_size())
+        return render_template('black_friday.html',
+                               cars=cars,
+                               total=total,
+                               has_more=has_more,
+                               brands=get_brands())
+    return conditional_page(render, *get_catalog_validator())
 
 
 @app.route('/car/<int:car_id>')
 def car_detail(car_id):
     """Individual car details"""
-    car = Car.query.get_or_404(car_id)
-    is_favorite = False
-    if current_user.is_authenticated:
-        is_favorite = Favorite.query.filter_by(user_id=current_user.id, car_id=car_id).first() is not None
-    return render_template('car_detail.html', car=car, is_favorite=is_favorite)
+    car = get_car(car_id)
+    if car is None:
+        abort(404)
+    is_favorite = car_id in favorite_car_ids()
+    return conditional_page(lambda: render_template('car_detail.html', car=car, is_favorite=is_favorite),
+                            car.updated_at, car.id)
 
 
 @app.route('/admin/seed-now')
@@ -242,6 +1737,7 @@ def car_detail(car_id):
 def seed_now():
     from app import init_db
     init_db()
+    catalog_cache.bump_version()
     count = Car.query.count()
     return f"Done! Cars in DB: {count}"
 
@@ -251,6 +1747,7 @@ def seed_now():
 # ============================================
 
 @app.route('/register', methods=['GET', 'POST'])
+@rate_limit('register', 5, 600, template='register.html')
 def register():
     """User registration"""
     if current_user.is_authenticated:
@@ -287,7 +1784,11 @@ def register():
             return render_template('register.html')
         
         # Create new user
-        hashed_password = bcrypt.generate_password_hash(password).decode('utf-8')
+        try:
+            hashed_password = password_hasher.hash(password)
+        except PasswordHasherBusy:
+            flash('The server is busy. Please try again in a moment.', 'danger')
+            return render_template('register.html')
         new_user = User(
             username=username,
             email=email,
@@ -311,6 +1812,8 @@ def register():
 
 
 @app.route('/login', methods=['GET', 'POST'])
+@rate_limit('login', 20, 300, template='login.html')
+@rate_limit('login-account', 10, 300, per='email', template='login.html')
 def login():
     """User login"""
     if current_user.is_authenticated:
@@ -323,7 +1826,20 @@ def login():
         
         user = User.query.filter_by(email=email).first()
         
-        if user and bcrypt.check_password_hash(user.password_hash, password):
+        try:
+            valid = user is not None and password_hasher.check(user.password_hash, password)
+        except PasswordHasherBusy:
+            flash('The server is busy. Please try again in a moment.', 'danger')
+            return render_template('login.html')
+        
+        if valid:
+            # Upgrade hashes made with an older cost factor while the plain password is at hand
+            if password_hasher.needs_rehash(user.password_hash):
+                try:
+                    user.password_hash = password_hasher.hash(password)
+                    db.session.commit()
+                except PasswordHasherBusy:
+                    pass
             login_user(user, remember=remember)
             flash(f'Welcome back, {user.username}!', 'success')
             next_page = request.args.get('next')
@@ -352,8 +1868,11 @@ def logout():
 def profile():
     """User profile page"""
     inquiries = Inquiry.query.filter_by(user_id=current_user.id).order_by(Inquiry.created_at.desc()).all()
-    favorites = Favorite.query.filter_by(user_id=current_user.id).all()
-    favorite_cars = [fav.car for fav in favorites]
+    favorite_cars = (Car.query
+                     .join(Favorite, Favorite.car_id == Car.id)
+                     .filter(Favorite.user_id == current_user.id)
+                     .order_by(Favorite.created_at.desc())
+                     .all())
     return render_template('profile.html', inquiries=inquiries, favorite_cars=favorite_cars)
 
 
@@ -362,27 +1881,33 @@ def profile():
 def edit_profile():
     """Edit user profile"""
     if request.method == 'POST':
-        current_user.full_name = request.form.get('full_name')
-        current_user.phone = request.form.get('phone')
+        user = current_user.record
+        user.full_name = request.form.get('full_name')
+        user.phone = request.form.get('phone')
         
         # Change password if provided
         current_password = request.form.get('current_password')
         new_password = request.form.get('new_password')
         
         if current_password and new_password:
-            if bcrypt.check_password_hash(current_user.password_hash, current_password):
-                if len(new_password) >= 6:
-                    current_user.password_hash = bcrypt.generate_password_hash(new_password).decode('utf-8')
-                    flash('Password updated successfully.', 'success')
+            try:
+                if password_hasher.check(user.password_hash, current_password):
+                    if len(new_password) >= 6:
+                        user.password_hash = password_hasher.hash(new_password)
+                        flash('Password updated successfully.', 'success')
+                    else:
+                        flash('New password must be at least 6 characters.', 'danger')
+                        return render_template('edit_profile.html')
                 else:
-                    flash('New password must be at least 6 characters.', 'danger')
+                    flash('Current password is incorrect.', 'danger')
                     return render_template('edit_profile.html')
-            else:
-                flash('Current password is incorrect.', 'danger')
+            except PasswordHasherBusy:
+                flash('The server is busy. Please try again in a moment.', 'danger')
                 return render_template('edit_profile.html')
         
         try:
             db.session.commit()
+            invalidate_identity(user.id)
             flash('Profile updated successfully.', 'success')
             return redirect(url_for('profile'))
         except Exception as e:
@@ -433,26 +1958,85 @@ def submit_contact():
         return redirect(url_for('index') + '#contact')
 
 
+# ============================================
+# ROUTES - CATALOG API
+# ============================================
+
+@app.route('/api/cars')
+def api_cars():
+    """Filtered, sorted and paged car listing for the Black Friday page.
+    ?card=<variant> adds each car's cached card HTML, so pages extend the grid
+    with the same markup the server rendered.
+    """
+    page = max(request.args.get('page', 1, type=int) or 1, 1)
+    per_page = get_page_size()
+    card = request.args.get('card')
+    if card is not None and card not in CAR_CARD_TEMPLATES:
+        return jsonify({'status': 'error', 'message': f'Unknown card variant: {card}'}), 400
+    cars, total, has_more = get_filtered_cars_page(request.args, page, per_page)
+    items = []
+    for car in cars:
+        item = car.to_dict()
+        if card:
+            item['card_html'] = str(car_card(car, card))
+        items.append(item)
+    return jsonify({
+        'cars': items,
+        'total': total,
+        'page': page,
+        'per_page': per_page,
+        'has_more': has_more
+    })
+
+
+@app.route('/api/search')
+def api_search():
+    """Ranked full-text search over the car inventory"""
+    query = request.args.get('q', '').strip()
+    if not search_terms(query):
+        return jsonify({'status': 'error', 'message': 'Search query is required'}), 400
+
+    page = max(request.args.get('page', 1, type=int) or 1, 1)
+    per_page = get_page_size()
+    cars, has_more = get_search_page(query, page, per_page)
+    return jsonify({
+        'query': query,
+        'cars': [car.to_dict() for car in cars],
+        'page': page,
+        'per_page': per_page,
+        'has_more': has_more
+    })
+
+
 # ============================================
 # ROUTES - FAVORITES
 # ============================================
 
 @app.route('/api/favorite/toggle/<int:car_id>', methods=['POST'])
+@rate_limit('api', 120, 60)
 @api_login_required
+@rate_limit('favorite', 30, 60, per='user')
 def toggle_favorite(car_id):
     """Toggle favorite status for a car"""
-    car = Car.query.get_or_404(car_id)
-    favorite = Favorite.query.filter_by(user_id=current_user.id, car_id=car_id).first()
-    
-    if favorite:
-        db.session.delete(favorite)
+    if delete_user_car(Favorite, current_user.id, car_id):
         db.session.commit()
+        invalidate_favorites(current_user.id)
         return jsonify({'status': 'removed', 'message': 'Removed from favorites'})
-    else:
-        new_favorite = Favorite(user_id=current_user.id, car_id=car_id)
-        db.session.add(new_favorite)
-        db.session.commit()
-        return jsonify({'status': 'added', 'message': 'Added to favorites'})
+
+    # Nothing inserted means either no such car or a concurrent click already added it
+    if not insert_user_car(Favorite, current_user.id, car_id) and db.session.get(Car, car_id) is None:
+        db.session.rollback()
+        abort(404)
+    db.session.commit()
+    invalidate_favorites(current_user.id)
+    return jsonify({'status': 'added', 'message': 'Added to favorites'})
+
+
+@app.route('/api/favorites')
+@api_login_required
+def favorite_ids():
+    """Get the ids of all cars the current user has favorited"""
+    return jsonify({'status': 'success', 'car_ids': sorted(get_favorite_ids(current_user.id))})
 
 
 # ============================================
@@ -463,68 +2047,149 @@ def toggle_favorite(car_id):
 @login_required
 def cart():
     """View shopping cart"""
-    cart_items = CartItem.query.filter_by(user_id=current_user.id).all()
-    total = sum(item.car.price for item in cart_items)
-    return render_template('cart.html', cart_items=cart_items, total=total)
+    cart_items, summary = get_cart(current_user.id)
+    return render_template('cart.html', cart_items=cart_items, summary=summary)
 
 
 @app.route('/api/cart/add/<int:car_id>', methods=['POST'])
+@rate_limit('api', 120, 60)
 @api_login_required
+@rate_limit('cart', 60, 60, per='user')
 def add_to_cart(car_id):
     """Add car to cart"""
-    car = Car.query.get_or_404(car_id)
-    
-    # Check if car is available
-    if car.status != 'available':
+    if insert_user_car(CartItem, current_user.id, car_id, Car.status == 'available'):
+        cart_count = adjust_cart_count(current_user.id, 1)
+        db.session.commit()
+        cache_cart_count(current_user.id, cart_count)
+        return jsonify({'status': 'added', 'message': 'Added to cart', 'cart_count': cart_count})
+
+    # Nothing inserted: work out why only on this rare path
+    db.session.rollback()
+    car_status = db.session.query(Car.status).filter(Car.id == car_id).scalar()
+    if car_status is None:
+        abort(404)
+    if car_status != 'available':
         return jsonify({'status': 'error', 'message': 'This car is not available'}), 400
-    
-    # Check if already in cart
-    existing = CartItem.query.filter_by(user_id=current_user.id, car_id=car_id).first()
-    if existing:
-        return jsonify({'status': 'exists', 'message': 'Car is already in your cart'})
-    
-    cart_item = CartItem(user_id=current_user.id, car_id=car_id)
-    db.session.add(cart_item)
-    db.session.commit()
-    
-    cart_count = CartItem.query.filter_by(user_id=current_user.id).count()
-    return jsonify({'status': 'added', 'message': 'Added to cart', 'cart_count': cart_count})
+    return jsonify({'status': 'exists', 'message': 'Car is already in your cart'})
 
 
 @app.route('/api/cart/remove/<int:car_id>', methods=['POST'])
+@rate_limit('api', 120, 60)
 @api_login_required
+@rate_limit('cart', 60, 60, per='user')
 def remove_from_cart(car_id):
     """Remove car from cart"""
-    cart_item = CartItem.query.filter_by(user_id=current_user.id, car_id=car_id).first()
-    
-    if cart_item:
-        db.session.delete(cart_item)
+    if delete_user_car(CartItem, current_user.id, car_id):
+        cart_count = adjust_cart_count(current_user.id, -1)
+        summary = get_cart_summary(current_user.id)
         db.session.commit()
-        cart_count = CartItem.query.filter_by(user_id=current_user.id).count()
-        return jsonify({'status': 'removed', 'message': 'Removed from cart', 'cart_count': cart_count})
-    
+        cache_cart_count(current_user.id, cart_count)
+        return jsonify({'status': 'removed', 'message': 'Removed from cart', 'cart_count': cart_count,
+                        'summary': summary})
+
+    db.session.rollback()
     return jsonify({'status': 'error', 'message': 'Item not found in cart'}), 404
 
 
+# Upper bound on car ids per /api/cart/batch request
+CART_BATCH_MAX_ITEMS = 50
+
+
+def parse_car_ids(value):
+    """Validate a JSON list of car ids, returning it de-duplicated in order, or None if invalid"""
+    if value is None:
+        return []
+    if not isinstance(value, list) or not all(isinstance(v, int) and not isinstance(v, bool)
+                                              and 1 <= v <= MAX_ROW_ID for v in value):
+        return None
+    return list(dict.fromkeys(value))
+
+
+@app.route('/api/cart/batch', methods=['POST'])
+@rate_limit('api', 120, 60)
+@api_login_required
+@rate_limit('cart', 60, 60, per='user')
+def cart_batch():
+    """Add and/or remove several cars in one transaction.
+    Body: {"add": [car_id, ...], "remove": [car_id, ...]}
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'status': 'error', 'message': 'Expected a JSON object body'}), 400
+    to_add = parse_car_ids(data.get('add'))
+    to_remove = parse_car_ids(data.get('remove'))
+
+    if to_add is None or to_remove is None:
+        return jsonify({'status': 'error', 'message': '"add" and "remove" must be lists of car ids'}), 400
+    if not to_add and not to_remove:
+        return jsonify({'status': 'error', 'message': 'No car ids given'}), 400
+    if len(to_add) + len(to_remove) > CART_BATCH_MAX_ITEMS:
+        return jsonify({'status': 'error', 'message': f'At most {CART_BATCH_MAX_ITEMS} car ids per request'}), 400
+    if set(to_add) & set(to_remove):
+        return jsonify({'status': 'error', 'message': 'A car cannot be both added and removed'}), 400
+
+    removed = delete_user_cars(CartItem, current_user.id, to_remove) if to_remove else set()
+    added = insert_user_cars(CartItem, current_user.id, to_add, Car.status == 'available') if to_add else set()
+
+    # Explain the ids that were not added with one lookup
+    skipped = [car_id for car_id in to_add if car_id not in added]
+    statuses = {}
+    in_cart = set()
+    if skipped:
+        statuses = dict(db.session.query(Car.id, Car.status).filter(Car.id.in_(skipped)).all())
+        in_cart = set(db.session.execute(
+            db.select(CartItem.car_id).where(CartItem.user_id == current_user.id, CartItem.car_id.in_(skipped))
+        ).scalars())
+
+    cart_count = adjust_cart_count(current_user.id, len(added) - len(removed))
+    db.session.commit()
+    cache_cart_count(current_user.id, cart_count)
+
+    results = []
+    for car_id in to_add:
+        if car_id in added:
+            status = 'added'
+        elif car_id in in_cart:
+            status = 'exists'
+        elif car_id in statuses:
+            status = 'unavailable'
+        else:
+            status = 'not_found'
+        results.append({'car_id': car_id, 'action': 'add', 'status': status})
+    for car_id in to_remove:
+        status = 'removed' if car_id in removed else 'not_in_cart'
+        results.append({'car_id': car_id, 'action': 'remove', 'status': status})
+
+    return jsonify({'status': 'success', 'results': results, 'cart_count': cart_count})
+
+
+@app.route('/api/cart/summary')
+@rate_limit('api', 120, 60, methods=('GET',))
+@api_login_required
+def cart_summary():
+    """Get cart item count, subtotal, discount and total"""
+    return jsonify({'status': 'success', 'summary': get_cart_summary(current_user.id)})
+
+
 @app.route('/api/cart/count')
+@rate_limit('api', 120, 60, methods=('GET',))
 @api_login_required
 def cart_count():
     """Get cart item count"""
-    count = CartItem.query.filter_by(user_id=current_user.id).count()
-    return jsonify({'count': count})
+    return jsonify({'count': get_cart_count(current_user.id)})
 
 
 @app.route('/checkout', methods=['GET', 'POST'])
 @login_required
 def checkout():
     """Checkout page with customer form"""
-    cart_items = CartItem.query.filter_by(user_id=current_user.id).all()
+    cart_items, summary = get_cart(current_user.id)
     
     if not cart_items:
         flash('Your cart is empty.', 'danger')
         return redirect(url_for('cart'))
     
-    total = sum(item.car.price for item in cart_items)
+    total = summary['total']
     
     if request.method == 'POST':
         # Get form data
@@ -539,7 +2204,7 @@ def checkout():
         # Validation
         if not all([full_name, email, phone, address, city, payment_method]):
             flash('Please fill in all required fields.', 'danger')
-            return render_template('checkout.html', cart_items=cart_items, total=total)
+            return render_template('checkout.html', cart_items=cart_items, summary=summary)
         
         # Validate card details if card payment is selected
         if payment_method == 'card':
@@ -550,16 +2215,48 @@ def checkout():
             
             if not all([card_number, card_holder, card_expiry, card_cvv]):
                 flash('Please fill in all card details.', 'danger')
-                return render_template('checkout.html', cart_items=cart_items, total=total)
+                return render_template('checkout.html', cart_items=cart_items, summary=summary)
+        
+        # Reserve every car at the version shown on the checkout form, all or nothing
+        expected_versions = {
+            item.car_id: request.form.get(f'car_version_{item.car_id}', item.car.version, type=int)
+            for item in cart_items
+        }
+        car_errors = reserve_cars(expected_versions)
+        if car_errors:
+            db.session.rollback()
+            flash('Some cars in your order are no longer available as shown.', 'danger')
+            cart_items, summary = get_cart(current_user.id)
+            return render_template('checkout.html', cart_items=cart_items, summary=summary,
+                                   car_errors=car_errors), 409
+        
+        # Record the order with a snapshot of each car's name and price
+        card_number = request.form.get('card_number', '').replace(' ', '')
+        order = Order(
+            user_id=current_user.id,
+            full_name=full_name,
+            email=email,
+            phone=phone,
+            address=address,
+            city=city,
+            notes=message or None,
+            payment_method=payment_method,
+            card_last4=card_number[-4:] if payment_method == 'card' and len(card_number) >= 4 else None,
+            total=total,
+            items=[OrderItem(car_id=item.car.id, car_name=item.car.name,
+                             price=item.car.price, discount=item.car.discount or 0)
+                   for item in cart_items]
+        )
+        db.session.add(order)
+        db.session.flush()
         
-        # Create inquiry for the order
+        # Create inquiry so the sales team sees the purchase request
         car_names = ', '.join([item.car.name for item in cart_items])
         
         # Build payment information string
         if payment_method == 'cash':
             payment_info = "Payment Method: Cash"
         else:
-            card_number = request.form.get('card_number', '').replace(' ', '')
             # Mask card number (show only last 4 digits)
             masked_card = '**** **** **** ' + card_number[-4:] if len(card_number) >= 4 else '****'
             payment_info = f"""Payment Method: Card
@@ -568,7 +2265,7 @@ def checkout():
 - Expiry: {request.form.get('card_expiry', '')}
 - CVV: ***"""
         
-        order_message = f"""Purchase request:
+        order_message = f"""Purchase request for order #{order.number}:
 - Vehicles: {car_names}
 - Total: ${total:,.0f}
 - Delivery Address: {address}, {city}
@@ -589,27 +2286,33 @@ def checkout():
         # Clear the cart
         for item in cart_items:
             db.session.delete(item)
+        adjust_cart_count(current_user.id)
         
         db.session.commit()
+        cache_cart_count(current_user.id, 0)
+        catalog_cache.bump_version()
         
         # Redirect to confirmation page
-        return redirect(url_for('order_confirmation', inquiry_id=inquiry.id))
+        return redirect(url_for('order_confirmation', order_id=order.id))
     
-    return render_template('checkout.html', cart_items=cart_items, total=total)
+    return render_template('checkout.html', cart_items=cart_items, summary=summary)
 
 
-@app.route('/order-confirmation/<int:inquiry_id>')
+@app.route('/order-confirmation/<int:order_id>')
 @login_required
-def order_confirmation(inquiry_id):
+def order_confirmation(order_id):
     """Order confirmation page"""
-    inquiry = Inquiry.query.get_or_404(inquiry_id)
+    order = (Order.query
+             .options(db.selectinload(Order.items))
+             .filter_by(id=order_id)
+             .first_or_404())
     
     # Ensure user can only see their own orders
-    if inquiry.user_id != current_user.id:
+    if order.user_id != current_user.id:
         flash('Access denied.', 'danger')
         return redirect(url_for('index'))
     
-    return render_template('order_confirmation.html', inquiry=inquiry)
+    return render_template('order_confirmation.html', order=order)
 
 
 # ============================================
@@ -621,15 +2324,14 @@ def order_confirmation(inquiry_id):
 @admin_required
 def admin_dashboard():
     """Admin dashboard"""
-    total_users = User.query.count()
-    total_cars = Car.query.count()
-    total_inquiries = Inquiry.query.count()
+    stats = get_dashboard_stats()
     recent_inquiries = Inquiry.query.order_by(Inquiry.created_at.desc()).limit(10).all()
     
     return render_template('admin/dashboard.html',
-                         total_users=total_users,
-                         total_cars=total_cars,
-                         total_inquiries=total_inquiries,
+                         stats=stats,
+                         total_users=stats['users'].get('', 0),
+                         total_cars=sum(stats['cars_by_status'].values()),
+                         total_inquiries=sum(stats['inquiries_by_status'].values()),
                          recent_inquiries=recent_inquiries)
 
 
@@ -677,6 +2379,9 @@ def admin_add_car():
                 features=request.form.get('features'),
                 discount=int(discount_val) if discount_val else 0
             )
+            stock_number = request.form.get('stock_number', '').strip()
+            if stock_number:
+                car.stock_number = stock_number
             
             db.session.add(car)
             db.session.commit()
@@ -687,8 +2392,10 @@ def admin_add_car():
                 if img_url.strip():
                     car_image = CarImage(car_id=car.id, image_url=img_url.strip(), order=idx)
                     db.session.add(car_image)
+                    car.updated_at = datetime.utcnow()
             
             db.session.commit()
+            catalog_cache.bump_version()
             flash('Car added successfully!', 'success')
             return redirect(url_for('admin_edit_car', car_id=car.id))
         except Exception as e:
@@ -715,6 +2422,7 @@ def admin_edit_car(car_id):
             acceleration = request.form.get('acceleration')
             mileage = request.form.get('mileage')
             
+            car.stock_number = request.form.get('stock_number', '').strip() or car.stock_number
             car.name = request.form.get('name')
             car.brand = request.form.get('brand')
             car.model = request.form.get('model')
@@ -737,6 +2445,7 @@ def admin_edit_car(car_id):
             car.discount = int(discount_val) if discount_val else 0
             
             db.session.commit()
+            catalog_cache.bump_version()
             flash('Car updated successfully!', 'success')
             return redirect(url_for('admin_edit_car', car_id=car.id))
         except Exception as e:
@@ -760,7 +2469,9 @@ def admin_add_car_image(car_id):
         max_order = db.session.query(db.func.max(CarImage.order)).filter_by(car_id=car_id).scalar() or 0
         car_image = CarImage(car_id=car_id, image_url=image_url.strip(), order=max_order + 1)
         db.session.add(car_image)
+        car.updated_at = datetime.utcnow()
         db.session.commit()
+        catalog_cache.bump_version()
         flash('Image added successfully!', 'success')
     else:
         flash('Please provide an image URL.', 'danger')
@@ -775,8 +2486,10 @@ def admin_delete_car_image(image_id):
     """Delete car image"""
     image = CarImage.query.get_or_404(image_id)
     car_id = image.car_id
+    image.car.updated_at = datetime.utcnow()
     db.session.delete(image)
     db.session.commit()
+    catalog_cache.bump_version()
     flash('Image deleted successfully!', 'success')
     return redirect(url_for('admin_edit_car', car_id=car_id))
 
@@ -792,6 +2505,7 @@ def admin_set_primary_image(image_id):
     # Update car's main image_url
     car.image_url = image.image_url
     db.session.commit()
+    catalog_cache.bump_version()
     
     flash('Main image updated!', 'success')
     return redirect(url_for('admin_edit_car', car_id=car.id))
@@ -805,826 +2519,152 @@ def admin_delete_car(car_id):
     car = Car.query.get_or_404(car_id)
     db.session.delete(car)
     db.session.commit()
+    catalog_cache.bump_version()
     flash('Car deleted successfully!', 'success')
     return redirect(url_for('admin_cars'))
 
 
+INQUIRY_STATUSES = ('new', 'contacted', 'closed')
+ADMIN_PAGE_SIZE = 25
+# Prefix-searched by the admin user directory
+USER_SEARCH_COLUMNS = ('username', 'email', 'full_name')
+
+
+def parse_date_arg(name):
+    """Read a YYYY-MM-DD query argument as a datetime, or None if missing or malformed"""
+    try:
+        return datetime.strptime(request.args.get(name, ''), '%Y-%m-%d')
+    except ValueError:
+        return None
+
+
 @app.route('/admin/inquiries')
 @login_required
 @admin_required
 def admin_inquiries():
-    """Admin inquiry management"""
-    inquiries = Inquiry.query.order_by(Inquiry.created_at.desc()).all()
-    return render_template('admin/inquiries.html', inquiries=inquiries)
+    """Admin inquiry queue, filtered by ?status=, ?date_from= and ?date_to= (YYYY-MM-DD)"""
+    query = Inquiry.query
+    
+    status = request.args.get('status', '')
+    if status in INQUIRY_STATUSES:
+        query = query.filter(Inquiry.status == status)
+    
+    date_from = parse_date_arg('date_from')
+    if date_from:
+        query = query.filter(Inquiry.created_at >= date_from)
+    date_to = parse_date_arg('date_to')
+    if date_to:
+        query = query.filter(Inquiry.created_at < date_to + timedelta(days=1))
+    
+    inquiries, next_cursor = paginate_newest(query, Inquiry, request.args.get('cursor'), ADMIN_PAGE_SIZE)
+    return render_template('admin/inquiries.html',
+                         inquiries=inquiries,
+                         next_cursor=next_cursor,
+                         statuses=INQUIRY_STATUSES)
+
+
+@app.route('/admin/inquiries/status', methods=['POST'])
+@login_required
+@admin_required
+def admin_update_inquiry_status():
+    """Move every selected inquiry to a new status in one statement"""
+    status = request.form.get('status')
+    inquiry_ids = request.form.getlist('inquiry_ids', type=int)
+    
+    if status not in INQUIRY_STATUSES:
+        flash('Invalid status.', 'danger')
+    elif not inquiry_ids:
+        flash('No inquiries selected.', 'danger')
+    else:
+        # Lock the rows that will change so the stat counters see the same old statuses
+        changing = (db.session.query(Inquiry.id, Inquiry.status, Inquiry.created_at)
+                    .filter(Inquiry.id.in_(inquiry_ids), Inquiry.status != status)
+                    .with_for_update()
+                    .all())
+        if changing:
+            db.session.execute(db.update(Inquiry)
+                               .where(Inquiry.id.in_([row.id for row in changing]))
+                               .values(status=status)
+                               .execution_options(synchronize_session=False))
+            deltas = {('inquiries_by_status', status): len(changing)}
+            for row in changing:
+                key = ('inquiries_by_status', row.status or 'new')
+                deltas[key] = deltas.get(key, 0) - 1
+            # A bulk UPDATE bypasses the ORM stats hooks
+            bump_stats(db.session.connection(), deltas)
+        db.session.commit()
+        flash(f'{len(changing)} inquiries marked as {status}.', 'success')
+    
+    next_page = request.form.get('next', '')
+    if not next_page.startswith('/admin/inquiries'):
+        next_page = url_for('admin_inquiries')
+    return redirect(next_page)
 
 
 @app.route('/admin/users')
 @login_required
 @admin_required
 def admin_users():
-    """Admin user management"""
-    users = User.query.order_by(User.created_at.desc()).all()
-    return render_template('admin/users.html', users=users)
+    """Admin user directory, searchable with ?q= on username, email or name prefix"""
+    query = db.session.query(User.id)
+    search = request.args.get('q', '').strip()
+    if search:
+        # lower(column) LIKE 'prefix%' can use the ix_user_*_lower indexes on PostgreSQL
+        pattern = search.lower().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        query = query.filter(db.or_(*(db.func.lower(getattr(User, column)).like(pattern, escape='\\')
+                                      for column in USER_SEARCH_COLUMNS)))
+    
+    # Counts are grouped over the current page's users only, all in one statement
+    page = newest_first(query, User, request.args.get('cursor')).limit(ADMIN_PAGE_SIZE + 1).subquery()
+    page_ids = db.select(page.c.id)
+    inquiry_counts = (db.session.query(Inquiry.user_id, db.func.count(Inquiry.id).label('count'))
+                      .filter(Inquiry.user_id.in_(page_ids))
+                      .group_by(Inquiry.user_id)
+                      .subquery())
+    favorite_counts = (db.session.query(Favorite.user_id, db.func.count(Favorite.id).label('count'))
+                       .filter(Favorite.user_id.in_(page_ids))
+                       .group_by(Favorite.user_id)
+                       .subquery())
+    users = (db.session.query(User,
+                              db.func.coalesce(inquiry_counts.c.count, 0),
+                              db.func.coalesce(favorite_counts.c.count, 0))
+             .join(page, page.c.id == User.id)
+             .outerjoin(inquiry_counts, inquiry_counts.c.user_id == User.id)
+             .outerjoin(favorite_counts, favorite_counts.c.user_id == User.id)
+             .order_by(User.created_at.desc(), User.id.desc())
+             .all())
+    next_cursor = encode_cursor(users[ADMIN_PAGE_SIZE - 1][0]) if len(users) > ADMIN_PAGE_SIZE else None
+    
+    roles = get_dashboard_stats()['users_by_role']
+    return render_template('admin/users.html',
+                         users=users[:ADMIN_PAGE_SIZE],
+                         next_cursor=next_cursor,
+                         total_users=sum(roles.values()),
+                         admin_count=roles.get('admin', 0))
 
 
-@app.route('/admin/seed-cars')
+@app.route('/admin/cache-stats')
 @login_required
 @admin_required
-def admin_seed_cars():
-    """One-time seeding of additional demo cars into existing database.
-    Safe to call multiple times: checks by unique (brand, model, year, price).
-    """
-    # Base sample cars definition reused from init_db
-    sample_cars = [
-
-        # 1
-        Car(
-            name="BMW M3 Competition",
-            brand="BMW",
-            model="M3 Competition",
-            year=2024,
-            price=88000,
-            horsepower=503,
-            engine="3.0L S58 Twin-Turbo I6",
-            transmission="Automatic",
-            fuel_type="Petrol",
-            mileage=0,
-            exterior_color="Isle of Man Green",
-            interior_color="Black Merino Leather",
-            top_speed=290,
-            acceleration=3.9,
-            description="The iconic sports sedan redefined. M3 Competition blends everyday usability with track-ready performance thanks to its 503 hp twin-turbo straight-six and rear-wheel drive.",
-            features="M Carbon Exterior, Adaptive M Suspension, Harman Kardon Sound, Head-Up Display, M Sport Exhaust, Carbon Fibre Trim, Heated Seats",
-            image_url="https://images.unsplash.com/photo-1617814076040-3ff861eb53c5?w=800&h=600&fit=crop",
-            status="available",
-            discount=8,
-        ),
-        # 2
-        Car(
-            name="Mercedes-AMG C 63 S E Performance",
-            brand="Mercedes-Benz",
-            model="AMG C 63 S E Performance",
-            year=2024,
-            price=95000,
-            horsepower=671,
-            engine="2.0L Turbo I4 + Electric Motor",
-            transmission="Automatic",
-            fuel_type="Hybrid",
-            mileage=0,
-            exterior_color="Obsidian Black",
-            interior_color="Nappa Red Leather",
-            top_speed=280,
-            acceleration=3.4,
-            description="A technological tour de force — the world's most powerful four-cylinder production car. The C 63 S E Performance fuses a turbocharged four-cylinder with an F1-derived electric motor for staggering performance.",
-            features="AMG Performance Exhaust, Burmester Sound, 360° Camera, MBUX Hyperscreen, Ceramic Brakes, Active Aerodynamics, Night Package",
-            image_url="https://images.unsplash.com/photo-1618843479313-40f8afb4b4d8?w=800&h=600&fit=crop",
-            status="available",
-            discount=12,
-        ),
-        # 3
-        Car(
-            name="Porsche Macan Turbo Electric",
-            brand="Porsche",
-            model="Macan Turbo Electric",
-            year=2024,
-            price=105000,
-            horsepower=639,
-            engine="Dual Electric Motors",
-            transmission="Automatic",
-            fuel_type="Electric",
-            mileage=0,
-            exterior_color="Carmine Red",
-            interior_color="Two-tone Black/Atacama Brown",
-            top_speed=260,
-            acceleration=3.3,
-            description="The new Macan Turbo Electric sets a new benchmark for performance SUVs. With 639 hp from dual electric motors and Porsche's famous chassis tuning, this is the most athletic Macan ever.",
-            features="PASM Sport Suspension, Porsche InnoDrive, 360° Camera, Panoramic Roof, Bose Surround Sound, 22-inch RS Spyder Wheels, Matrix LED",
-            image_url="https://images.unsplash.com/photo-1597009512841-07c5d8e8f11a?w=800&h=600&fit=crop",
-            status="available",
-            discount=6,
-        ),
-        # 4
-        Car(
-            name="Audi RS6 Avant",
-            brand="Audi",
-            model="RS6 Avant",
-            year=2024,
-            price=120000,
-            horsepower=621,
-            engine="4.0L V8 Biturbo",
-            transmission="Automatic",
-            fuel_type="Petrol",
-            mileage=0,
-            exterior_color="Nardo Grey",
-            interior_color="Black Valcona Leather",
-            top_speed=305,
-            acceleration=3.4,
-            description="The super estate that does everything. RS6 Avant combines a 621 hp V8 with a spacious wagon body, making it the ultimate blend of everyday practicality and supercar performance.",
-            features="RS Dynamic Package, Carbon Fibre Optics, B&O 3D Sound, Night Vision Assist, Quattro Sport Diff, HD Matrix LED, Bang & Olufsen",
-            image_url="https://images.unsplash.com/photo-1606664515524-ed2f786a0bd6?w=800&h=600&fit=crop",
-            status="available",
-            discount=10,
-        ),
-        # 5
-        Car(
-            name="Ferrari F8 Tributo",
-            brand="Ferrari",
-            model="F8 Tributo",
-            year=2023,
-            price=295000,
-            horsepower=710,
-            engine="3.9L V8 Twin-Turbo",
-            transmission="Semi-Automatic",
-            fuel_type="Petrol",
-            mileage=1200,
-            exterior_color="Rosso Corsa",
-            interior_color="Nero Pregiato Alcantara",
-            top_speed=340,
-            acceleration=2.9,
-            description="The F8 Tributo is a tribute to Ferrari's best V8 engine ever — the most powerful V8 in Ferrari history. Its mid-rear configuration and advanced aerodynamics deliver a thrilling driving experience.",
-            features="Ferrari Side Slip Control 6.1, Carbon Fibre Package, Daytona Seats, Forged Wheels, Lift System, Scuderia Ferrari Shields, Apple CarPlay",
-            image_url="https://images.unsplash.com/photo-1583121274602-3e2820c69888?w=800&h=600&fit=crop",
-            status="available",
-            discount=5,
-        ),
-        # 6
-        Car(
-            name="Lamborghini Revuelto",
-            brand="Lamborghini",
-            model="Revuelto",
-            year=2024,
-            price=580000,
-            horsepower=1001,
-            engine="6.5L V12 + 3 Electric Motors",
-            transmission="Semi-Automatic",
-            fuel_type="Hybrid",
-            mileage=0,
-            exterior_color="Verde Mantis",
-            interior_color="Nero Cosmus / Bianco Leda",
-            top_speed=350,
-            acceleration=2.5,
-            description="The Revuelto ushers in a new era for Lamborghini. With over 1,000 hp from a hybridized V12, carbon-fibre monocoque and all-electric front axle, it is the most technologically advanced Lamborghini ever.",
-            features="ALA 3.0 Aero, Carbon Ceramic Brakes, Lamborghini Infotainment, Night Vision, Forged Composites, Transparent Engine Cover, LDVI",
-            image_url="https://images.unsplash.com/photo-1544636331-e26879cd4d9b?w=800&h=600&fit=crop",
-            status="available",
-            discount=0,
-        ),
-        # 7
-        Car(
-            name="Rolls-Royce Spectre",
-            brand="Rolls-Royce",
-            model="Spectre",
-            year=2024,
-            price=430000,
-            horsepower=577,
-            engine="Dual Electric Motors",
-            transmission="Automatic",
-            fuel_type="Electric",
-            mileage=0,
-            exterior_color="Andalusian White",
-            interior_color="Seashell / Selby Grey",
-            top_speed=250,
-            acceleration=4.5,
-            description="The Spectre is the first fully electric Rolls-Royce — and the most technologically advanced motor car in the marque's history. Bespoke silence, effortless performance and peerless craftsmanship.",
-            features="Starlight Headliner, Spirit of Ecstasy Illuminated, Bespoke Audio, Picnic Tables, Gallery Dashboard, Gallery Fascia, Self-Closing Doors",
-            image_url="https://images.unsplash.com/photo-1563720360172-67b8f3dce741?w=800&h=600&fit=crop",
-            status="available",
-            discount=0,
-        ),
-        # 8
-        Car(
-            name="Bentley Flying Spur S",
-            brand="Bentley",
-            model="Flying Spur S",
-            year=2024,
-            price=235000,
-            horsepower=542,
-            engine="2.9L V6 Hybrid",
-            transmission="Automatic",
-            fuel_type="Hybrid",
-            mileage=0,
-            exterior_color="Midnight Emerald",
-            interior_color="Portland / Beluga Two-Tone",
-            top_speed=290,
-            acceleration=4.0,
-            description="The Flying Spur S is the sportiest, most dynamic iteration of Bentley's flagship four-door grand tourer, with a lowered sport chassis, black styling accents and an electrified powertrain.",
-            features="All-Wheel Steering, Naim Audio, Electronic All-Wheel Drive, Air Suspension, Massage Seats, Head-Up Display, Bentley Rotating Display",
-            image_url="https://images.unsplash.com/photo-1566023888272-99e93c2e4e1a?w=800&h=600&fit=crop",
-            status="available",
-            discount=9,
-        ),
-        # 9
-        Car(
-            name="Aston Martin Vantage",
-            brand="Aston Martin",
-            model="Vantage",
-            year=2024,
-            price=180000,
-            horsepower=665,
-            engine="4.0L V8 Twin-Turbo",
-            transmission="Automatic",
-            fuel_type="Petrol",
-            mileage=0,
-            exterior_color="Iridescent Lime",
-            interior_color="Obsidian Black Semi-Aniline",
-            top_speed=325,
-            acceleration=3.5,
-            description="The new Vantage is a raw, thrilling sports car defined by driver engagement. Its 665 hp AMG-sourced twin-turbo V8, new suspension geometry and electronic rear differential make it the most exciting Vantage ever.",
-            features="Electronic Rear Differential, Carbon Fibre Pack, Sports Exhaust, Heated Leather Seats, Wireless Apple CarPlay, 10.25-inch Touchscreen",
-            image_url="https://images.unsplash.com/photo-1502877338535-766e1452684a?w=800&h=600&fit=crop",
-            status="available",
-            discount=7,
-        ),
-        # 10
-        Car(
-            name="McLaren Artura",
-            brand="McLaren",
-            model="Artura",
-            year=2024,
-            price=245000,
-            horsepower=700,
-            engine="3.0L V6 Twin-Turbo + Electric Motor",
-            transmission="Semi-Automatic",
-            fuel_type="Hybrid",
-            mileage=0,
-            exterior_color="Aztec Gold",
-            interior_color="Alcantara Dark Fern",
-            top_speed=330,
-            acceleration=3.0,
-            description="The Artura is McLaren's first series-production High-Performance Hybrid supercar. An all-new carbon-fibre architecture, a twin-turbo V6 and an electric motor combine for exceptional performance and efficiency.",
-            features="Proactive Chassis Control III, Carbon Ceramic Brakes, Bowers & Wilkins Audio, Track Telemetry, McLaren Track App, Electrochromic Roof",
-            image_url="https://images.unsplash.com/photo-1517336714731-489689fd1ca8?w=800&h=600&fit=crop",
-            status="available",
-            discount=5,
-        ),
-        # 11
-        Car(
-            name="Maserati GranTurismo Folgore",
-            brand="Maserati",
-            model="GranTurismo Folgore",
-            year=2024,
-            price=230000,
-            horsepower=761,
-            engine="Three Electric Motors",
-            transmission="Automatic",
-            fuel_type="Electric",
-            mileage=0,
-            exterior_color="Blu Nobile",
-            interior_color="Pieno Fiore Natural Leather",
-            top_speed=325,
-            acceleration=2.7,
-            description="The GranTurismo Folgore is Maserati's first all-electric car and the most powerful road-legal Maserati ever produced. Three electric motors deliver 761 hp and an Italian sports car soundtrack.",
-            features="Active Aerodynamics, Carbon Fibre Body Kit, Sonus Faber Premium Audio, 21-inch Alloys, Adaptive Dampers, Maserati Connect",
-            image_url="https://images.unsplash.com/photo-1607860108855-737a99c0c9ee?w=800&h=600&fit=crop",
-            status="available",
-            discount=11,
-        ),
-        # 12
-        Car(
-            name="Porsche 718 Cayman GT4 RS",
-            brand="Porsche",
-            model="718 Cayman GT4 RS",
-            year=2023,
-            price=175000,
-            horsepower=500,
-            engine="4.0L Naturally Aspirated Flat-6",
-            transmission="Semi-Automatic",
-            fuel_type="Petrol",
-            mileage=3500,
-            exterior_color="Python Green",
-            interior_color="Black Alcantara / Carmine Red",
-            top_speed=315,
-            acceleration=3.4,
-            description="The GT4 RS borrows its engine directly from the 911 GT3 — a screaming naturally aspirated flat-six revving to 9,000 rpm. With race-car aero and motorsport suspension, it is the ultimate Cayman.",
-            features="Weissach Package, Carbon Fibre Hood, Bucket Seats, Titanium Exhaust, Porsche Track Precision App, Front Axle Lift, Lightweight Sport Package",
-            image_url="https://images.unsplash.com/photo-1503376780353-7e6692767b70?w=800&h=600&fit=crop",
-            status="available",
-            discount=6,
-        ),
-        # 13
-        Car(
-            name="BMW XM Label Red",
-            brand="BMW",
-            model="XM Label Red",
-            year=2024,
-            price=185000,
-            horsepower=738,
-            engine="4.4L V8 Hybrid",
-            transmission="Automatic",
-            fuel_type="Hybrid",
-            mileage=0,
-            exterior_color="Frozen Deep Grey",
-            interior_color="Merino Red / Black",
-            top_speed=270,
-            acceleration=3.8,
-            description="The XM Label Red is the most powerful BMW M vehicle ever built for public roads. 738 hp from a hybridized V8, an aggressive widebody design and a luxurious cabin make it an icon of excess.",
-            features="M Carbon Ceramic Brakes, M Professional Sound, Laser Headlights, M Ride & Drive Modes, Rear Entertainment, Bowers & Wilkins Diamond Sound",
-            image_url="https://images.unsplash.com/photo-1551972873-b7e7c2ad1cf0?w=800&h=600&fit=crop",
-            status="available",
-            discount=15,
-        ),
-        # 14
-        Car(
-            name="Mercedes-AMG One",
-            brand="Mercedes-Benz",
-            model="AMG One",
-            year=2023,
-            price=2700000,
-            horsepower=1063,
-            engine="1.6L F1 Hybrid V6 + 4 Electric Motors",
-            transmission="Semi-Automatic",
-            fuel_type="Hybrid",
-            mileage=800,
-            exterior_color="Magno High-tech Silver",
-            interior_color="Black AMG Performance Fabric",
-            top_speed=352,
-            acceleration=2.9,
-            description="Formula 1 technology for the road. The AMG ONE uses a literal F1 power unit — a 1.6L hybrid V6 from Lewis Hamilton's championship car — to deliver 1,063 hp and world-record Nürburgring times.",
-            features="Active Aero DRS, Full Carbon Body, Titanium Exhaust, Motorsport Steering Wheel, 10-point Harness Option, Active Underbody, HECU",
-            image_url="https://images.unsplash.com/photo-1616788494670-5d6c10f86b39?w=800&h=600&fit=crop",
-            status="reserved",
-            discount=0,
-        ),
-        # 15
-        Car(
-            name="Ferrari Purosangue",
-            brand="Ferrari",
-            model="Purosangue",
-            year=2024,
-            price=400000,
-            horsepower=715,
-            engine="6.5L Naturally Aspirated V12",
-            transmission="Semi-Automatic",
-            fuel_type="Petrol",
-            mileage=0,
-            exterior_color="Giallo Modena",
-            interior_color="Beige Connolly / Carbon",
-            top_speed=310,
-            acceleration=3.3,
-            description="Ferrari's first-ever SUV is nothing short of a revolution. The Purosangue uses a front-mid-mounted 715 hp V12 and rear-opening suicide doors to deliver Ferrari driving pleasure with four-seat practicality.",
-            features="Active Suspension Technology, Carbon Ceramic Brakes, JBL Professional Audio, Head-Up Display, Ventilated Rear Seats, Variable Geometry Diffuser",
-            image_url="https://images.unsplash.com/photo-1525609004556-c46c7d6cf023?w=800&h=600&fit=crop",
-            status="available",
-            discount=3,
-        ),
-        # 16
-        Car(
-            name="Lamborghini Urus Performante",
-            brand="Lamborghini",
-            model="Urus Performante",
-            year=2024,
-            price=285000,
-            horsepower=666,
-            engine="4.0L V8 Twin-Turbo",
-            transmission="Automatic",
-            fuel_type="Petrol",
-            mileage=0,
-            exterior_color="Arancio Borealis",
-            interior_color="Nero Ade / Arancio Dac Alcantara",
-            top_speed=306,
-            acceleration=3.3,
-            description="The Urus Performante is the most performance-focused Super SUV ever made. Lighter, faster and sharper than the standard Urus, with carbon-fibre aero and an Akrapovič exhaust.",
-            features="Akrapovič Exhaust, Carbon Fibre Bonnet, Sport Seats, Rear-Wheel Steering, All-Terrain Traction Control, Lambo Infotainment 3rd Gen",
-            image_url="https://images.unsplash.com/photo-1542291026-7eec264c27ff?w=800&h=600&fit=crop",
-            status="available",
-            discount=7,
-        ),
-        # 17
-        Car(
-            name="Range Rover Sport PHEV",
-            brand="Land Rover",
-            model="Range Rover Sport PHEV",
-            year=2024,
-            price=115000,
-            horsepower=510,
-            engine="3.0L I6 Mild Hybrid + Electric",
-            transmission="Automatic",
-            fuel_type="Hybrid",
-            mileage=0,
-            exterior_color="Lantau Bronze",
-            interior_color="Ebony / Ivory Semi-Aniline",
-            top_speed=240,
-            acceleration=5.4,
-            description="The Sport PHEV combines electrified efficiency with the legendary Range Rover capability. 510 hp, up to 70 km of electric range and Terrain Response 2 ensure composure in every environment.",
-            features="Meridian Signature Sound, Rear Entertainment, 3D Surround Camera, Terrain Response 2, Air Suspension, Massage Seats, 360-Degree Camera",
-            image_url="https://images.unsplash.com/photo-1551301622-6fa51afe75a9?w=800&h=600&fit=crop",
-            status="available",
-            discount=10,
-        ),
-        # 18
-        Car(
-            name="Audi R8 V10 GT RWD",
-            brand="Audi",
-            model="R8 V10 GT RWD",
-            year=2023,
-            price=230000,
-            horsepower=620,
-            engine="5.2L Naturally Aspirated V10",
-            transmission="Semi-Automatic",
-            fuel_type="Petrol",
-            mileage=2100,
-            exterior_color="Suzuka Grey",
-            interior_color="Fine Nappa Black / Red Stitch",
-            top_speed=329,
-            acceleration=3.4,
-            description="The R8 GT RWD is the final, purest chapter in the R8 story. A naturally aspirated V10 driving the rear wheels only, with stripped-out GT specification — the last great analogue Audi supercar.",
-            features="Carbon Ceramic Brakes, Carbon Fibre Package, GT Bucket Seats, Titanium Exhaust, Bang & Olufsen Sound, Magnetic Ride, Audi Laser Light",
-            image_url="https://images.unsplash.com/photo-1503736334956-4c8f8e92946d?w=800&h=600&fit=crop",
-            status="available",
-            discount=8,
-        ),
-        # 19
-        Car(
-            name="Porsche 911 GT3 Touring",
-            brand="Porsche",
-            model="911 GT3 Touring",
-            year=2024,
-            price=215000,
-            horsepower=510,
-            engine="4.0L Naturally Aspirated Flat-6",
-            transmission="Manual",
-            fuel_type="Petrol",
-            mileage=0,
-            exterior_color="GT Silver Metallic",
-            interior_color="Classic Cognac Leather",
-            top_speed=320,
-            acceleration=3.9,
-            description="The GT3 Touring is the connoisseur's choice — all the performance of the GT3 but without the wing, creating the most elegant, subtle and satisfying 911 money can buy.",
-            features="6-Speed Manual, PCCB Ceramic Brakes, Weissach Package Option, Touring Package, Alcantara Steering Wheel, Porsche Track Precision App",
-            image_url="https://images.unsplash.com/photo-1503376780353-7e6692767b70?w=800&h=600&fit=crop",
-            status="available",
-            discount=4,
-        ),
-        # 20
-        Car(
-            name="Rolls-Royce Dawn",
-            brand="Rolls-Royce",
-            model="Dawn",
-            year=2022,
-            price=395000,
-            horsepower=563,
-            engine="6.6L V12 Twin-Turbo",
-            transmission="Automatic",
-            fuel_type="Petrol",
-            mileage=4800,
-            exterior_color="Cobalto Blue",
-            interior_color="White / Dark Teak",
-            top_speed=250,
-            acceleration=4.9,
-            description="The most social car Rolls-Royce has ever made. The Dawn's four-seat, soft-top convertible body and hushed V12 create an unrivalled open-air luxury experience.",
-            features="Starlight Headliner, Bespoke Audio, Lambswool Rugs, Coach Doors Option, Silver Rain Umbrella, Gallery Fascia, Spirit of Ecstasy",
-            image_url="https://images.unsplash.com/photo-1552519507-da3b142c6e3d?w=800&h=600&fit=crop",
-            status="available",
-            discount=6,
-        ),
-        # 21
-        Car(
-            name="Bentley Mulliner Batur",
-            brand="Bentley",
-            model="Mulliner Batur",
-            year=2024,
-            price=1950000,
-            horsepower=740,
-            engine="6.0L W12 Twin-Turbo",
-            transmission="Automatic",
-            fuel_type="Petrol",
-            mileage=0,
-            exterior_color="Batur Blue",
-            interior_color="Diamond Quilted Two-Tone Leather",
-            top_speed=320,
-            acceleration=3.4,
-            description="The Batur is Bentley Mulliner's most exclusive creation — only 18 were made. A reimagined W12 in a breath-taking bespoke body previews the future design language of Bentley.",
-            features="Naim for Bentley Audio, 21-inch Forged Wheels, Titanium Exhaust, Bespoke Paint, Hand-stitched Interior, Night Vision, Bentley Dynamic Ride",
-            image_url="https://images.unsplash.com/photo-1553440569-bcc63803a83d?w=800&h=600&fit=crop",
-            status="reserved",
-            discount=0,
-        ),
-        # 22
-        Car(
-            name="BMW M8 Competition Gran Coupe",
-            brand="BMW",
-            model="M8 Competition Gran Coupe",
-            year=2024,
-            price=145000,
-            horsepower=625,
-            engine="4.4L V8 Twin-Turbo",
-            transmission="Automatic",
-            fuel_type="Petrol",
-            mileage=0,
-            exterior_color="Frozen Marina Bay Blue",
-            interior_color="Merino Smoke White",
-            top_speed=305,
-            acceleration=3.2,
-            description="Four doors, 625 horses. The M8 Competition Gran Coupé is the ultimate expression of BMW's coupe-inspired four-door luxury, combining M performance with executive practicality.",
-            features="M Driver's Package, Bowers & Wilkins Diamond Audio, M Carbon Exterior Package, Laser Lights, Driving Assistant Pro, Soft-Close Doors",
-            image_url="https://images.unsplash.com/photo-1555215695-3004980ad54e?w=800&h=600&fit=crop",
-            status="available",
-            discount=13,
-        ),
-        # 23
-        Car(
-            name="Mercedes-Benz GLE 63 S Coupe",
-            brand="Mercedes-Benz",
-            model="GLE 63 S Coupe",
-            year=2024,
-            price=155000,
-            horsepower=612,
-            engine="4.0L V8 Biturbo + EQ Boost",
-            transmission="Automatic",
-            fuel_type="Petrol",
-            mileage=0,
-            exterior_color="Selenite Grey",
-            interior_color="Nappa Sienna Brown",
-            top_speed=280,
-            acceleration=3.8,
-            description="A coupe SUV with supercar performance. The GLE 63 S Coupe combines a sleek fastback roofline, AMG-tuned chassis, and 612 hp V8 for the most dramatic Mercedes SUV experience.",
-            features="AMG Ride Control+, Burmester High-End Sound, MBUX Infotainment, Night Package, AMG Performance Exhaust, 22-inch AMG Wheels",
-            image_url="https://images.unsplash.com/photo-1618843479313-40f8afb4b4d8?w=800&h=600&fit=crop",
-            status="available",
-            discount=11,
-        ),
-        # 24
-        Car(
-            name="Koenigsegg Jesko Attack",
-            brand="Koenigsegg",
-            model="Jesko Attack",
-            year=2024,
-            price=3000000,
-            horsepower=1600,
-            engine="5.0L Twin-Turbo V8",
-            transmission="Semi-Automatic",
-            fuel_type="Petrol",
-            mileage=0,
-            exterior_color="Naked Carbon",
-            interior_color="White Alcantara / Carbon",
-            top_speed=330,
-            acceleration=2.5,
-            description="The Jesko Attack is optimized for track performance and downforce. With 1,600 hp, the revolutionary Light Speed Transmission and over 1,000 kg of downforce, it pushes the boundary of what is physically possible.",
-            features="LST Transmission, Active Aero, Triplex Rear Suspension, Carbon Fibre Monocoque, Full Telemetry, Track-focused Downforce Package",
-            image_url="https://images.unsplash.com/photo-1518961293243-23567f1f2bee?w=800&h=600&fit=crop",
-            status="available",
-            discount=0,
-        ),
-        # 25
-        Car(
-            name="Aston Martin DBS 770 Ultimate",
-            brand="Aston Martin",
-            model="DBS 770 Ultimate",
-            year=2024,
-            price=385000,
-            horsepower=770,
-            engine="5.2L V12 Twin-Turbo",
-            transmission="Automatic",
-            fuel_type="Petrol",
-            mileage=0,
-            exterior_color="Quantum Silver",
-            interior_color="Obsidian Black / Sahara Tan Semi-Aniline",
-            top_speed=340,
-            acceleration=3.2,
-            description="The DBS 770 Ultimate is the last V12-powered Aston Martin front-engined grand tourer — and the most powerful. 770 hp, an upgraded chassis and an unapologetically dramatic presence.",
-            features="Carbon Fibre Aero Package, Ventilated Sport Seats, Sports Exhaust, Bang & Olufsen Audio, Skyhook Suspension, 21-inch Forged Wheels",
-            image_url="https://images.unsplash.com/photo-1611339555312-e607c8352fd3?w=800&h=600&fit=crop",
-            status="available",
-            discount=4,
-        ),
-        # 26
-        Car(
-            name="Porsche 911 Dakar",
-            brand="Porsche",
-            model="911 Dakar",
-            year=2023,
-            price=245000,
-            horsepower=480,
-            engine="3.0L Twin-Turbo Flat-6",
-            transmission="Automatic",
-            fuel_type="Petrol",
-            mileage=1800,
-            exterior_color="Roughroad Yellow",
-            interior_color="Black / Chalk Houndstooth",
-            top_speed=240,
-            acceleration=4.5,
-            description="Inspired by Porsche's Dakar Rally victories, the 911 Dakar is an off-road-capable 911 with raised suspension, all-terrain tyres, and the full 911 performance DNA — equally at home on tarmac or desert.",
-            features="Rallye Design Package, Roof Tent Option, Lightweight Package, Off-Road Mode, PTV Plus, Sport Chrono Package, Dakar Heritage stickers",
-            image_url="https://images.unsplash.com/photo-1541447271487-09612b3f49af?w=800&h=600&fit=crop",
-            status="available",
-            discount=7,
-        ),
-        # 27
-        Car(
-            name="Bentley Bacalar",
-            brand="Bentley",
-            model="Bacalar",
-            year=2022,
-            price=1800000,
-            horsepower=650,
-            engine="6.0L W12 Twin-Turbo",
-            transmission="Automatic",
-            fuel_type="Petrol",
-            mileage=600,
-            exterior_color="Beluga Black",
-            interior_color="River Silver / Dark Satin Walnut",
-            top_speed=300,
-            acceleration=3.5,
-            description="A Barchetta body, carbon-fibre chassis and hand-built Mulliner craftsmanship define the Bacalar — one of only 12 ever made, one of the rarest and most exclusive cars on earth.",
-            features="Naim Audio, Dual Heritage Gauges, Porcelain Wing Mirrors, 22-inch Forged Wheels, Lacquered Veneers, Bespoke Mulliner Build",
-            image_url="https://images.unsplash.com/photo-1552519507-49a56be3f2c4?w=800&h=600&fit=crop",
-            status="reserved",
-            discount=0,
-        ),
-        # 28
-        Car(
-            name="Ferrari 296 GTB",
-            brand="Ferrari",
-            model="296 GTB",
-            year=2024,
-            price=325000,
-            horsepower=830,
-            engine="3.0L V6 Twin-Turbo + Electric Motor",
-            transmission="Semi-Automatic",
-            fuel_type="Hybrid",
-            mileage=0,
-            exterior_color="Blu Pozzi",
-            interior_color="Grigio Fabrics / Carbon",
-            top_speed=330,
-            acceleration=2.9,
-            description="A hybrid revolution. The 296 GTB introduces a new turbocharged V6 plug-in hybrid architecture to Ferrari, delivering 830 hp with a high-revving soundtrack previously thought impossible from six cylinders.",
-            features="Assetto Fiorano Package, Carbon Fibre Wheels, Pyrotechnic Seatbelts, Ferrari Side Slip Control 7.0, Virtual Short Wheelbase 2.0",
-            image_url="https://images.unsplash.com/photo-1617806118233-18e1de247200?w=800&h=600&fit=crop",
-            status="available",
-            discount=4,
-        ),
-        # 29
-        Car(
-            name="McLaren 765LT",
-            brand="McLaren",
-            model="765LT",
-            year=2022,
-            price=380000,
-            horsepower=765,
-            engine="4.0L V8 Twin-Turbo",
-            transmission="Semi-Automatic",
-            fuel_type="Petrol",
-            mileage=2900,
-            exterior_color="Papaya Spark",
-            interior_color="Carbon Black Alcantara",
-            top_speed=330,
-            acceleration=2.8,
-            description="LT — Longtail. The 765LT takes the Senna-derived aerodynamic package to the road. Carbon body panels, titanium exhaust, carbon-ceramic brakes and 765 hp make it McLaren's most focused road car.",
-            features="Senna-derived Aero Kit, Titanium Exhaust, Carbon Ceramic Brakes, MSO Carbon Fibre Pack, Active Dynamics Panel, Track Telemetry App",
-            image_url="https://images.unsplash.com/photo-1544636331-0b1c3f4e5111?w=800&h=600&fit=crop",
-            status="available",
-            discount=6,
-        ),
-        # 30
-        Car(
-            name="Mercedes-Maybach S 680",
-            brand="Mercedes-Benz",
-            model="Maybach S 680",
-            year=2024,
-            price=230000,
-            horsepower=612,
-            engine="6.0L V12 Biturbo",
-            transmission="Automatic",
-            fuel_type="Petrol",
-            mileage=0,
-            exterior_color="Obsidian Black / Selenite Silver",
-            interior_color="Macchiato Beige / Leather Nappa",
-            top_speed=250,
-            acceleration=4.5,
-            description="The S 680 4MATIC is the pinnacle of the Mercedes-Maybach range — a two-tone, V12-powered ultra-luxury limousine with a handcrafted interior, champagne flutes, and a rear seat experience beyond compare.",
-            features="Maybach Executive Rear Seats, Burmester High-End 4D Sound, Champagne Flutes, Rear Seat Entertainment, Magic Sky Control, Hot Stone Massage",
-            image_url="https://images.unsplash.com/photo-1621924609320-9f9e2a1d8232?w=800&h=600&fit=crop",
-            status="available",
-            discount=9,
-        ),
-
-        # same sample cars as in init_db (6 base ones) + extended list
-        Car(
-            name='BMW M5 Competition',
-            brand='BMW',
-            model='M5 Competition',
-            year=2024,
-            price=110000,
-            horsepower=625,
-            description='The ultimate expression of performance luxury. With 625 horsepower and cutting-edge technology, this sedan redefines the boundaries of speed and sophistication.',
-            image_url='https://images.unsplash.com/photo-1555215695-3004980ad54e?w=800&h=600&fit=crop',
-            status='available',
-            discount=15
-        ),
-        Car(
-            name='Mercedes-Benz S-Class',
-            brand='Mercedes-Benz',
-            model='S-Class',
-            year=2024,
-            price=115000,
-            horsepower=429,
-            description='The pinnacle of automotive luxury and innovation. Experience unparalleled comfort, advanced technology, and timeless elegance in every journey.',
-            image_url='https://images.unsplash.com/photo-1618843479313-40f8afb4b4d8?w=800&h=600&fit=crop',
-            status='available',
-            discount=10
-        ),
-        Car(
-            name='Porsche 911 Turbo S',
-            brand='Porsche',
-            model='911 Turbo S',
-            year=2024,
-            price=230000,
-            horsepower=640,
-            description='An icon perfected through generations. This masterpiece delivers breathtaking performance with 640 horsepower while maintaining the legendary 911 silhouette.',
-            image_url='https://images.unsplash.com/photo-1503376780353-7e6692767b70?w=800&h=600&fit=crop',
-            status='available',
-            discount=5
-        ),
-        Car(
-            name='Audi RS7 Sportback',
-            brand='Audi',
-            model='RS7 Sportback',
-            year=2024,
-            price=125000,
-            horsepower=591,
-            description='Where aggressive design meets refined luxury. The RS7 combines a powerful twin-turbo V8 with sophisticated Quattro all-wheel drive for uncompromising performance.',
-            image_url='https://images.unsplash.com/photo-1606664515524-ed2f786a0bd6?w=800&h=600&fit=crop',
-            status='available',
-            discount=20
-        ),
-        Car(
-            name='Lamborghini Huracán EVO',
-            brand='Lamborghini',
-            model='Huracán EVO',
-            year=2024,
-            price=275000,
-            horsepower=631,
-            description='Italian passion incarnate. The Huracán EVO delivers visceral supercar thrills with its naturally aspirated V10 engine and razor-sharp handling dynamics.',
-            image_url='https://images.unsplash.com/photo-1544636331-e26879cd4d9b?w=800&h=600&fit=crop',
-            status='available',
-            discount=8
-        ),
-        Car(
-            name='Rolls-Royce Ghost',
-            brand='Rolls-Royce',
-            model='Ghost',
-            year=2024,
-            price=350000,
-            horsepower=563,
-            description='The epitome of luxury motoring. Handcrafted to perfection, the Ghost offers an unparalleled sanctuary of tranquility, bespoke craftsmanship, and effortless power.',
-            image_url='https://images.unsplash.com/photo-1563720360172-67b8f3dce741?w=800&h=600&fit=crop',
-            status='available',
-            discount=0
-        ),
-        # Extended list (same as in init_db; shortened for brevity in seeding comments)
-        Car(
-            name='BMW X7 M60i',
-            brand='BMW',
-            model='X7 M60i',
-            year=2024,
-            price=135000,
-            horsepower=530,
-            description='Full-size luxury SUV with three rows, V8 power and the latest BMW technology suite.',
-            image_url='https://images.unsplash.com/photo-1551972873-b7e7c2ad1cf0?w=800&h=600&fit=crop',
-            status='available',
-            discount=12
-        ),
-        Car(
-            name='BMW i7 xDrive60',
-            brand='BMW',
-            model='i7 xDrive60',
-            year=2024,
-            price=155000,
-            horsepower=544,
-            description='All-electric flagship sedan combining silent performance with cutting-edge luxury.',
-            image_url='https://images.unsplash.com/photo-1617814076040-3ff861eb53c5?w=800&h=600&fit=crop',
-            status='available',
-            discount=18
-        ),
-        Car(
-            name='BMW M4 Competition Coupe',
-            brand='BMW',
-            model='M4 Competition',
-            year=2024,
-            price=98000,
-            horsepower=503,
-            description='High-performance coupe with aggressive styling and track-focused dynamics.',
-            image_url='https://images.unsplash.com/photo-1533473359331-0135ef1b58bf?w=800&h=600&fit=crop',
-            status='available',
-            discount=10
-        ),
-        # ... (остальные модели такие же, как в init_db; они все будут добавлены этим же способом)
-    ]
+def admin_cache_stats():
+    """Catalog, fragment and identity cache hit/miss counters for this worker"""
+    return jsonify({
+        'catalog': catalog_cache.stats(),
+        'fragments': fragment_cache.stats(),
+        'identities': identity_cache.stats(),
+        'favorites': favorite_cache.stats(),
+        'cart_counts': cart_count_cache.stats()
+    })
 
-    added = 0
-    for car in sample_cars:
-        exists = Car.query.filter_by(
-            brand=car.brand,
-            model=car.model,
-            year=car.year,
-            price=car.price
-        ).first()
-        if not exists:
-            db.session.add(car)
-            added += 1
 
+@app.route('/admin/seed-cars')
+@login_required
+@admin_required
+def admin_seed_cars():
+    """One-time seeding of additional demo cars into existing database"""
+    added = seed_demo_cars()
     if added > 0:
-        db.session.commit()
+        catalog_cache.bump_version()
         flash(f'{added} demo cars have been added to the catalog.', 'success')
     else:
         flash('No new cars were added. All demo cars are already in the database.', 'info')
@@ -1632,6 +2672,293 @@ def admin_seed_cars():
     return redirect(url_for('admin_cars'))
 
 
+@app.route('/admin/cars/import', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def admin_import_cars():
+    """Bulk create or update cars from an uploaded CSV or JSONL file"""
+    if request.method == 'GET':
+        return render_template('admin/car_import.html', report=None, error=None, fields=CAR_TRANSFER_FIELDS)
+
+    upload = request.files.get('file')
+    fmt = upload.filename.rsplit('.', 1)[-1].lower() if upload and '.' in upload.filename else ''
+    if fmt not in CAR_TRANSFER_FORMATS:
+        return render_template('admin/car_import.html', report=None, fields=CAR_TRANSFER_FIELDS,
+                               error='Please choose a .csv or .jsonl file.'), 400
+
+    stream = io.TextIOWrapper(upload.stream, encoding='utf-8-sig', newline='')
+    try:
+        report = import_cars(stream, fmt)
+    except UnicodeDecodeError:
+        # Batches before the bad bytes are already committed
+        db.session.rollback()
+        return render_template('admin/car_import.html', report=None, fields=CAR_TRANSFER_FIELDS,
+                               error='The file must be UTF-8 encoded; rows before the invalid bytes were imported.'), 400
+    print(f"Car import: {report['created']} created, {report['updated']} updated, {report['failed']} failed")
+    return render_template('admin/car_import.html', report=report, error=None, fields=CAR_TRANSFER_FIELDS)
+
+
+@app.route('/admin/cars/export.<fmt>')
+@login_required
+@admin_required
+def admin_export_cars(fmt):
+    """Download the whole catalog as CSV or JSONL, streamed as it is read"""
+    if fmt not in CAR_TRANSFER_FORMATS:
+        abort(404)
+    response = Response(stream_with_context(export_cars(fmt)), mimetype=CAR_TRANSFER_FORMATS[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename=cars-{datetime.utcnow():%Y%m%d}.{fmt}'
+    return response
+
+
+# ============================================
+# DATABASE SEEDING
+# ============================================
+
+# Seed catalogs shipped with the app: the first-run sample and the larger demo set
+SEED_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+SAMPLE_CARS_FILE = os.path.join(SEED_DATA_DIR, 'sample_cars.jsonl')
+DEMO_CARS_FILE = os.path.join(SEED_DATA_DIR, 'demo_cars.jsonl')
+# A seed car counts as present when a car with the same values already exists
+SEED_CAR_KEY = ('brand', 'model', 'year', 'price')
+
+
+def load_seed_cars(path):
+    """Read a seed catalog: one JSON object of car columns per line"""
+    with open(path, encoding='utf-8') as stream:
+        return [json.loads(line) for line in stream if line.strip()]
+
+
+def seed_cars(path):
+    """Add the cars in path that are not in the catalog yet, matched on
+    SEED_CAR_KEY, with a single INSERT ... SELECT in the current transaction.
+    Returns how many cars were added.
+    """
+    cars = Car.__table__
+    rows = load_seed_cars(path)
+    columns = sorted({column for row in rows for column in row} | set(CAR_IMPORT_DEFAULTS) | {'stock_number'})
+    seed = db.values(*[db.column(column, cars.c[column].type) for column in columns], name='seed').data([
+        tuple(new_stock_number() if column == 'stock_number' else row.get(column, CAR_IMPORT_DEFAULTS.get(column))
+              for column in columns)
+        for row in rows
+    ]).cte('seed')
+    present = db.select(cars.c.id).where(*[cars.c[column] == seed.c[column] for column in SEED_CAR_KEY])
+    # Cast so PostgreSQL does not type an all-NULL column of the VALUES list as text
+    source = (db.select(*[db.cast(seed.c[column], cars.c[column].type) for column in columns])
+              .where(~present.exists()))
+    statement = cars.insert().from_select(columns, source)
+
+    if not db.engine.dialect.insert_returning:
+        added = db.session.execute(statement).rowcount
+        rebuild_stats(db.session.connection())
+        return added
+    # Counted from the returned rows, since this bulk INSERT fires no mapper events
+    deltas = {}
+    added = db.session.execute(statement.returning(cars.c.status, cars.c.brand)).all()
+    for row in added:
+        for key in car_stat_keys(row.status, row.brand):
+            deltas[key] = deltas.get(key, 0) + 1
+    bump_stats(db.session.connection(), deltas)
+    return len(added)
+
+
+def seed_demo_cars():
+    """Add the demo catalog to an existing database and return how many cars were added.
+    Safe to call multiple times: skips cars already present by (brand, model, year, price).
+    """
+    added = seed_cars(DEMO_CARS_FILE)
+    if added > 0:
+        db.session.commit()
+    return added
+
+
+# ============================================
+# SCHEMA MIGRATIONS
+# ============================================
+
+class SchemaVersion(db.Model):
+    """Applied schema migrations, one row per version"""
+    version = db.Column(db.Integer, primary_key=True)
+    description = db.Column(db.String(200))
+    applied_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+# Arbitrary key for pg_advisory_xact_lock, shared by every process running migrate()
+MIGRATION_LOCK_ID = 72405310
+
+
+def add_column_if_missing(conn, table, column, ddl):
+    """ALTER TABLE ... ADD COLUMN unless the column already exists; returns True if added"""
+    columns = {col['name'] for col in sa_inspect(conn).get_columns(table)}
+    if column in columns:
+        return False
+    # Quoted, since "user" is a reserved word on PostgreSQL
+    conn.execute(text(f"ALTER TABLE {conn.dialect.identifier_preparer.quote(table)} ADD COLUMN {column} {ddl}"))
+    return True
+
+
+def migration_create_tables(conn):
+    db.metadata.create_all(bind=conn)
+
+
+def migration_car_discount(conn):
+    add_column_if_missing(conn, 'car', 'discount', 'INTEGER DEFAULT 0')
+
+
+def migration_car_updated_at(conn):
+    if add_column_if_missing(conn, 'car', 'updated_at', 'TIMESTAMP'):
+        conn.execute(text("UPDATE car SET updated_at = created_at WHERE updated_at IS NULL"))
+
+
+def model_indexes(model, *names):
+    """The named indexes of model's table; migrations list theirs explicitly so
+    indexes added to the model later are left to the migration that adds them
+    """
+    indexes = {index.name: index for index in model.__table__.indexes}
+    return [indexes[name] for name in names]
+
+
+def migration_hot_indexes(conn):
+    inspector = sa_inspect(conn)
+    for model, names in (
+        (Car, ('ix_car_status_created_at', 'ix_car_available_created_at')),
+        (Inquiry, ('ix_inquiry_created_at', 'ix_inquiry_user_created_at')),
+        (Favorite, ('uq_favorite_user_car',)),
+        (CartItem, ('uq_cart_item_user_car',)),
+    ):
+        table = model.__table__
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in model_indexes(model, *names):
+            if index.name in existing:
+                continue
+            if index.unique:
+                # Keep the oldest row of any duplicates so the (user_id, car_id) index can be built
+                columns = ', '.join(column.name for column in index.columns)
+                conn.execute(text(
+                    f"DELETE FROM {table.name} WHERE id NOT IN "
+                    f"(SELECT MIN(id) FROM {table.name} GROUP BY {columns})"
+                ))
+            index.create(bind=conn)
+
+
+def migration_user_cart_count(conn):
+    if add_column_if_missing(conn, 'user', 'cart_count', 'INTEGER NOT NULL DEFAULT 0'):
+        counts = (db.select(db.func.count(CartItem.id))
+                  .where(CartItem.user_id == User.id)
+                  .scalar_subquery())
+        conn.execute(db.update(User).values(cart_count=counts))
+
+
+def migration_car_version(conn):
+    add_column_if_missing(conn, 'car', 'version', 'INTEGER NOT NULL DEFAULT 1')
+
+
+def migration_orders(conn):
+    Order.__table__.create(bind=conn, checkfirst=True)
+    OrderItem.__table__.create(bind=conn, checkfirst=True)
+
+
+def migration_stat_counters(conn):
+    StatCounter.__table__.create(bind=conn, checkfirst=True)
+    rebuild_stats(conn)
+
+
+def migration_inquiry_status_index(conn):
+    for index in model_indexes(Inquiry, 'ix_inquiry_status_created_at'):
+        index.create(bind=conn, checkfirst=True)
+
+
+def migration_user_directory(conn):
+    for index in model_indexes(User, 'ix_user_created_at'):
+        index.create(bind=conn, checkfirst=True)
+    # Fills the new users_by_role counters
+    rebuild_stats(conn)
+
+
+def migration_car_stock_number(conn):
+    if add_column_if_missing(conn, 'car', 'stock_number', 'VARCHAR(50)'):
+        cars = Car.__table__
+        conn.execute(cars.update()
+                     .where(cars.c.stock_number.is_(None))
+                     .values(stock_number=db.literal('PM-') + db.cast(cars.c.id, db.String)))
+    for index in (*model_indexes(Car, 'ux_car_stock_number'), *model_indexes(CarImage, 'ix_car_image_car_id')):
+        index.create(bind=conn, checkfirst=True)
+
+
+def migration_user_search_indexes(conn):
+    # SQLite cannot use an index for a LIKE prefix on lower(); the table scan stays there
+    if conn.dialect.name != 'postgresql':
+        return
+    for column in USER_SEARCH_COLUMNS:
+        conn.execute(text(
+            f'CREATE INDEX IF NOT EXISTS ix_user_{column}_lower ON "user" (lower({column}) text_pattern_ops)'
+        ))
+
+
+# Append-only: every migration must be safe to run against a database that
+# create_all() already brought up to date, since version 1 creates all tables
+MIGRATIONS = [
+    (1, 'Create tables', migration_create_tables),
+    (2, 'Add car.discount', migration_car_discount),
+    (3, 'Add car.updated_at', migration_car_updated_at),
+    (4, 'Add favorite/cart uniqueness and hot lookup indexes', migration_hot_indexes),
+    (5, 'Create full-text search index', ensure_search_index),
+    (6, 'Add user.cart_count', migration_user_cart_count),
+    (7, 'Add car.version', migration_car_version),
+    (8, 'Create orders and order_item tables', migration_orders),
+    (9, 'Create and fill dashboard stat counters', migration_stat_counters),
+    (10, 'Index inquiry (status, created_at)', migration_inquiry_status_index),
+    (11, 'Index user (created_at, id) and count users by role', migration_user_directory),
+    (12, 'Add car.stock_number and index car_image.car_id', migration_car_stock_number),
+    (13, 'Index lower() of user search columns on PostgreSQL', migration_user_search_indexes),
+]
+LATEST_SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn):
+    """Return the applied schema version, or None if schema_version does not exist yet"""
+    try:
+        return conn.execute(text("SELECT MAX(version) FROM schema_version")).scalar() or 0
+    except (OperationalError, ProgrammingError):
+        return None
+
+
+def migrate():
+    """Apply pending migrations and return how many were applied.
+
+    The fast path is a single version query. Otherwise all pending
+    migrations run in one transaction under a database lock (an advisory
+    lock on PostgreSQL, BEGIN IMMEDIATE on SQLite), and the version is
+    re-read once the lock is held, so concurrent callers apply each
+    migration exactly once.
+    """
+    with db.engine.connect() as conn:
+        if get_schema_version(conn) == LATEST_SCHEMA_VERSION:
+            return 0
+
+    with db.engine.connect() as conn:
+        dialect = conn.dialect.name
+        if dialect == 'sqlite':
+            conn.exec_driver_sql('BEGIN IMMEDIATE')
+        else:
+            conn.begin()
+            if dialect == 'postgresql':
+                conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {'id': MIGRATION_LOCK_ID})
+
+        SchemaVersion.__table__.create(bind=conn, checkfirst=True)
+        current = get_schema_version(conn)
+        pending = [migration for migration in MIGRATIONS if migration[0] > current]
+
+        for version, description, apply in pending:
+            apply(conn)
+            conn.execute(SchemaVersion.__table__.insert().values(
+                version=version, description=description, applied_at=datetime.utcnow()
+            ))
+            print(f"Migration {version}: {description}")
+
+        conn.commit()
+    return len(pending)
+
+
 # ============================================
 # DATABASE INITIALIZATION
 # ============================================
@@ -1639,7 +2966,7 @@ def admin_seed_cars():
 def init_db():
     """Initialize database with sample data"""
     with app.app_context():
-        db.create_all()
+        migrate()
         
         # Create admin user if not exists
         if not User.query.filter_by(username='admin').first():
@@ -1653,440 +2980,8 @@ def init_db():
             db.session.add(admin)
         
         # Add sample cars if database is empty
-        if True:
-            sample_cars = [
-                Car(
-                    name='BMW M5 Competition',
-                    brand='BMW',
-                    model='M5 Competition',
-                    year=2024,
-                    price=110000,
-                    horsepower=625,
-                    description='The ultimate expression of performance luxury. With 625 horsepower and cutting-edge technology, this sedan redefines the boundaries of speed and sophistication.',
-                    image_url='https://images.unsplash.com/photo-1555215695-3004980ad54e?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=15
-                ),
-                Car(
-                    name='Mercedes-Benz S-Class',
-                    brand='Mercedes-Benz',
-                    model='S-Class',
-                    year=2024,
-                    price=115000,
-                    horsepower=429,
-                    description='The pinnacle of automotive luxury and innovation. Experience unparalleled comfort, advanced technology, and timeless elegance in every journey.',
-                    image_url='https://images.unsplash.com/photo-1618843479313-40f8afb4b4d8?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=10
-                ),
-                Car(
-                    name='Porsche 911 Turbo S',
-                    brand='Porsche',
-                    model='911 Turbo S',
-                    year=2024,
-                    price=230000,
-                    horsepower=640,
-                    description='An icon perfected through generations. This masterpiece delivers breathtaking performance with 640 horsepower while maintaining the legendary 911 silhouette.',
-                    image_url='https://images.unsplash.com/photo-1503376780353-7e6692767b70?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=5
-                ),
-                Car(
-                    name='Audi RS7 Sportback',
-                    brand='Audi',
-                    model='RS7 Sportback',
-                    year=2024,
-                    price=125000,
-                    horsepower=591,
-                    description='Where aggressive design meets refined luxury. The RS7 combines a powerful twin-turbo V8 with sophisticated Quattro all-wheel drive for uncompromising performance.',
-                    image_url='https://images.unsplash.com/photo-1606664515524-ed2f786a0bd6?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=20
-                ),
-                Car(
-                    name='Lamborghini Huracán EVO',
-                    brand='Lamborghini',
-                    model='Huracán EVO',
-                    year=2024,
-                    price=275000,
-                    horsepower=631,
-                    description='Italian passion incarnate. The Huracán EVO delivers visceral supercar thrills with its naturally aspirated V10 engine and razor-sharp handling dynamics.',
-                    image_url='https://images.unsplash.com/photo-1544636331-e26879cd4d9b?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=8
-                ),
-                Car(
-                    name='Rolls-Royce Ghost',
-                    brand='Rolls-Royce',
-                    model='Ghost',
-                    year=2024,
-                    price=350000,
-                    horsepower=563,
-                    description='The epitome of luxury motoring. Handcrafted to perfection, the Ghost offers an unparalleled sanctuary of tranquility, bespoke craftsmanship, and effortless power.',
-                    image_url='https://images.unsplash.com/photo-1563720360172-67b8f3dce741?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=0
-                ),
-                # Additional BMW models
-                Car(
-                    name='BMW X7 M60i',
-                    brand='BMW',
-                    model='X7 M60i',
-                    year=2024,
-                    price=135000,
-                    horsepower=530,
-                    description='Full-size luxury SUV with three rows, V8 power and the latest BMW technology suite.',
-                    image_url='https://images.unsplash.com/photo-1551972873-b7e7c2ad1cf0?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=12
-                ),
-                Car(
-                    name='BMW i7 xDrive60',
-                    brand='BMW',
-                    model='i7 xDrive60',
-                    year=2024,
-                    price=155000,
-                    horsepower=544,
-                    description='All-electric flagship sedan combining silent performance with cutting-edge luxury.',
-                    image_url='https://images.unsplash.com/photo-1617814076040-3ff861eb53c5?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=18
-                ),
-                Car(
-                    name='BMW M4 Competition Coupe',
-                    brand='BMW',
-                    model='M4 Competition',
-                    year=2024,
-                    price=98000,
-                    horsepower=503,
-                    description='High-performance coupe with aggressive styling and track-focused dynamics.',
-                    image_url='https://images.unsplash.com/photo-1533473359331-0135ef1b58bf?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=10
-                ),
-                # Mercedes-Benz models
-                Car(
-                    name='Mercedes-AMG G 63',
-                    brand='Mercedes-Benz',
-                    model='AMG G 63',
-                    year=2024,
-                    price=195000,
-                    horsepower=577,
-                    description='Iconic luxury off-roader with handcrafted AMG V8 and unmistakable presence.',
-                    image_url='https://images.unsplash.com/photo-1616788494670-5d6c10f86b39?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=7
-                ),
-                Car(
-                    name='Mercedes-Benz EQS 580',
-                    brand='Mercedes-Benz',
-                    model='EQS 580',
-                    year=2024,
-                    price=140000,
-                    horsepower=516,
-                    description='Electric luxury sedan with futuristic interior and exceptional refinement.',
-                    image_url='https://images.unsplash.com/photo-1621924609320-9f9e2a1d8232?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=15
-                ),
-                Car(
-                    name='Mercedes-AMG GT 63 S',
-                    brand='Mercedes-Benz',
-                    model='AMG GT 63 S',
-                    year=2024,
-                    price=185000,
-                    horsepower=630,
-                    description='Four-door supercar with breathtaking performance and everyday usability.',
-                    image_url='https://images.unsplash.com/photo-1544636331-0b1c3f4e5111?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=9
-                ),
-                # Audi models
-                Car(
-                    name='Audi R8 V10 Performance',
-                    brand='Audi',
-                    model='R8 V10',
-                    year=2023,
-                    price=210000,
-                    horsepower=602,
-                    description='Naturally aspirated V10 supercar with quattro traction and everyday comfort.',
-                    image_url='https://images.unsplash.com/photo-1503736334956-4c8f8e92946d?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=6
-                ),
-                Car(
-                    name='Audi e-tron GT RS',
-                    brand='Audi',
-                    model='e-tron GT RS',
-                    year=2024,
-                    price=145000,
-                    horsepower=637,
-                    description='Electric grand tourer blending sustainable performance with Audi design.',
-                    image_url='https://images.unsplash.com/photo-1618005198919-d3d4b5a92eee?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=13
-                ),
-                Car(
-                    name='Audi Q8 e-tron',
-                    brand='Audi',
-                    model='Q8 e-tron',
-                    year=2024,
-                    price=98000,
-                    horsepower=402,
-                    description='Premium electric SUV offering space, comfort and emission-free driving.',
-                    image_url='https://images.unsplash.com/photo-1618005198919-5e5b9aef1261?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=11
-                ),
-                # Porsche models
-                Car(
-                    name='Porsche Taycan Turbo S',
-                    brand='Porsche',
-                    model='Taycan Turbo S',
-                    year=2024,
-                    price=205000,
-                    horsepower=750,
-                    description='All-electric sports sedan delivering instant torque and Porsche handling.',
-                    image_url='https://images.unsplash.com/photo-1617814076040-d99f8c3d0f89?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=14
-                ),
-                Car(
-                    name='Porsche Cayenne Turbo GT',
-                    brand='Porsche',
-                    model='Cayenne Turbo GT',
-                    year=2024,
-                    price=190000,
-                    horsepower=631,
-                    description='Performance SUV with Nürburgring credentials and everyday practicality.',
-                    image_url='https://images.unsplash.com/photo-1597009512841-07c5d8e8f11a?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=10
-                ),
-                Car(
-                    name='Porsche Panamera 4 E-Hybrid',
-                    brand='Porsche',
-                    model='Panamera 4 E-Hybrid',
-                    year=2024,
-                    price=125000,
-                    horsepower=455,
-                    description='Plug-in hybrid luxury sedan balancing efficiency and performance.',
-                    image_url='https://images.unsplash.com/photo-1541447271487-09612b3f49af?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=8
-                ),
-                # Lamborghini & Ferrari
-                Car(
-                    name='Lamborghini Urus S',
-                    brand='Lamborghini',
-                    model='Urus S',
-                    year=2024,
-                    price=260000,
-                    horsepower=657,
-                    description='Super SUV combining Lamborghini DNA with daily usability.',
-                    image_url='https://images.unsplash.com/photo-1542291026-7eec264c27ff?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=7
-                ),
-                Car(
-                    name='Lamborghini Aventador SVJ',
-                    brand='Lamborghini',
-                    model='Aventador SVJ',
-                    year=2021,
-                    price=520000,
-                    horsepower=759,
-                    description='Track-focused V12 flagship with extreme aerodynamics and presence.',
-                    image_url='https://images.unsplash.com/photo-1511919884226-fd3cad34687c?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=5
-                ),
-                Car(
-                    name='Ferrari SF90 Stradale',
-                    brand='Ferrari',
-                    model='SF90 Stradale',
-                    year=2023,
-                    price=480000,
-                    horsepower=986,
-                    description='Plug-in hybrid hypercar that redefines the limits of road-legal performance.',
-                    image_url='https://images.unsplash.com/photo-1525609004556-c46c7d6cf023?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=9
-                ),
-                Car(
-                    name='Ferrari Roma',
-                    brand='Ferrari',
-                    model='Roma',
-                    year=2024,
-                    price=245000,
-                    horsepower=612,
-                    description='Elegant grand tourer with a minimalist interior and turbocharged V8.',
-                    image_url='https://images.unsplash.com/photo-1617806118233-18e1de247200?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=11
-                ),
-                Car(
-                    name='Ferrari 812 Superfast',
-                    brand='Ferrari',
-                    model='812 Superfast',
-                    year=2022,
-                    price=410000,
-                    horsepower=789,
-                    description='Front-engined V12 masterpiece with blistering acceleration and drama.',
-                    image_url='https://images.unsplash.com/photo-1516397281156-ca07cf9746fc?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=6
-                ),
-                # Rolls-Royce & Bentley
-                Car(
-                    name='Rolls-Royce Cullinan',
-                    brand='Rolls-Royce',
-                    model='Cullinan',
-                    year=2024,
-                    price=380000,
-                    horsepower=563,
-                    description='Ultra-luxury SUV offering unmatched comfort on any terrain.',
-                    image_url='https://images.unsplash.com/photo-1542281286-9e0a16bb7366?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=4
-                ),
-                Car(
-                    name='Rolls-Royce Phantom',
-                    brand='Rolls-Royce',
-                    model='Phantom',
-                    year=2023,
-                    price=520000,
-                    horsepower=563,
-                    description='The ultimate expression of chauffeur-driven luxury and craftsmanship.',
-                    image_url='https://images.unsplash.com/photo-1552519507-da3b142c6e3d?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=3
-                ),
-                Car(
-                    name='Bentley Continental GT Speed',
-                    brand='Bentley',
-                    model='Continental GT Speed',
-                    year=2024,
-                    price=260000,
-                    horsepower=650,
-                    description='High-performance grand tourer with handcrafted interior and W12 power.',
-                    image_url='https://images.unsplash.com/photo-1552519507-49a56be3f2c4?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=10
-                ),
-                Car(
-                    name='Bentley Bentayga EWB',
-                    brand='Bentley',
-                    model='Bentayga EWB',
-                    year=2024,
-                    price=245000,
-                    horsepower=542,
-                    description='Extended wheelbase luxury SUV with lounge-like rear seating.',
-                    image_url='https://images.unsplash.com/photo-1553440569-bcc63803a83d?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=8
-                ),
-                # Maserati & Aston Martin
-                Car(
-                    name='Maserati MC20',
-                    brand='Maserati',
-                    model='MC20',
-                    year=2024,
-                    price=235000,
-                    horsepower=621,
-                    description='Mid-engined Italian supercar with a twin-turbo V6 Nettuno engine.',
-                    image_url='https://images.unsplash.com/photo-1607860108855-737a99c0c9ee?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=9
-                ),
-                Car(
-                    name='Maserati Levante Trofeo',
-                    brand='Maserati',
-                    model='Levante Trofeo',
-                    year=2023,
-                    price=155000,
-                    horsepower=580,
-                    description='Performance SUV with Ferrari-derived V8 and distinctive Maserati style.',
-                    image_url='https://images.unsplash.com/photo-1583445095369-9c573c908385?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=7
-                ),
-                Car(
-                    name='Aston Martin DB11 AMR',
-                    brand='Aston Martin',
-                    model='DB11 AMR',
-                    year=2022,
-                    price=245000,
-                    horsepower=630,
-                    description='Grand tourer with twin-turbo V12 and unmistakable Aston Martin design.',
-                    image_url='https://images.unsplash.com/photo-1502877338535-766e1452684a?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=6
-                ),
-                Car(
-                    name='Aston Martin DBX707',
-                    brand='Aston Martin',
-                    model='DBX707',
-                    year=2024,
-                    price=235000,
-                    horsepower=697,
-                    description='Ultra-high-performance SUV with supercar acceleration and luxury interior.',
-                    image_url='https://images.unsplash.com/photo-1611339555312-e607c8352fd3?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=8
-                ),
-                # Range Rover & others
-                Car(
-                    name='Range Rover SV Autobiography',
-                    brand='Land Rover',
-                    model='Range Rover SV',
-                    year=2024,
-                    price=210000,
-                    horsepower=557,
-                    description='Flagship SUV with opulent rear seating and commanding road presence.',
-                    image_url='https://images.unsplash.com/photo-1551301622-6fa51afe75a9?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=5
-                ),
-                Car(
-                    name='Range Rover Sport SVR',
-                    brand='Land Rover',
-                    model='Range Rover Sport SVR',
-                    year=2023,
-                    price=155000,
-                    horsepower=575,
-                    description='Performance SUV combining off-road capability with V8 power.',
-                    image_url='https://images.unsplash.com/photo-1530047520930-dce1309622a0?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=7
-                ),
-                Car(
-                    name='McLaren 720S Coupe',
-                    brand='McLaren',
-                    model='720S',
-                    year=2022,
-                    price=315000,
-                    horsepower=710,
-                    description='Carbon-fiber supercar with breathtaking acceleration and aerodynamics.',
-                    image_url='https://images.unsplash.com/photo-1517336714731-489689fd1ca8?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=6
-                ),
-                Car(
-                    name='Bugatti Chiron Sport',
-                    brand='Bugatti',
-                    model='Chiron Sport',
-                    year=2021,
-                    price=3200000,
-                    horsepower=1500,
-                    description='Ultimate hypercar icon with quad-turbo W16 and extraordinary craftsmanship.',
-                    image_url='https://images.unsplash.com/photo-1518961293243-23567f1f2bee?w=800&h=600&fit=crop',
-                    status='available',
-                    discount=2
-                )
-            ]
-
-            for car in sample_cars:
-                db.session.add(car)
+        if Car.query.first() is None:
+            seed_cars(SAMPLE_CARS_FILE)
         
         try:
             db.session.commit()
@@ -2122,38 +3017,51 @@ def currency_filter(value):
 
 
 # ============================================
-# AUTO-INITIALIZE DATABASE ON STARTUP
+# CLI COMMANDS
 # ============================================
 
-# Initialize database when app starts (for production deployment)
-# This runs when gunicorn starts the app
-with app.app_context():
-    try:
-        # Check if database is initialized by trying to query a table
-        from sqlalchemy import inspect as sa_inspect, text
-        inspector = sa_inspect(db.engine)
-        tables = inspector.get_table_names()
-        if not tables:
-            # Database tables don't exist, initialize them
-            print("Database not initialized. Creating tables...")
-            init_db()
-        else:
-            print(f"Database already initialized with {len(tables)} tables.")
-            # Migration: add 'discount' column if missing
-            if 'car' in tables:
-                existing_cols = [col['name'] for col in inspector.get_columns('car')]
-                if 'discount' not in existing_cols:
-                    with db.engine.connect() as conn:
-                        conn.execute(text("ALTER TABLE car ADD COLUMN discount INTEGER DEFAULT 0"))
-                        conn.commit()
-                    print("Migration: added 'discount' column to car table.")
-    except Exception as e:
-        # If we can't check, try to initialize anyway
-        print(f"Checking database status failed: {e}. Attempting initialization...")
-        try:
-            init_db()
-        except Exception as init_error:
-            print(f"Initialization error (may be normal if tables exist): {init_error}")
+@app.cli.command('migrate')
+def migrate_command():
+    """Apply pending database schema migrations."""
+    applied = migrate()
+    print(f"Applied {applied} migration(s); schema is at version {LATEST_SCHEMA_VERSION}.")
+
+
+@app.cli.command('init-db')
+def init_db_command():
+    """One-time setup: apply migrations and create the admin account and sample cars if missing.
+    Deploys run only 'migrate', so a renamed or deleted admin account is not recreated.
+    """
+    init_db()
+
+
+@app.cli.command('rebuild-stats')
+def rebuild_stats_command():
+    """Recompute the dashboard counters from the source tables."""
+    with db.engine.begin() as conn:
+        rebuild_stats(conn)
+    print("Dashboard stats rebuilt.")
+
+
+@app.cli.command('import-cars')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+def import_cars_command(path):
+    """Create or update cars from a .csv or .jsonl file, keyed on stock_number."""
+    fmt = path.rsplit('.', 1)[-1].lower()
+    if fmt not in CAR_TRANSFER_FORMATS:
+        raise click.BadParameter('expected a .csv or .jsonl file', param_hint='PATH')
+    with open(path, encoding='utf-8-sig', newline='') as stream:
+        report = import_cars(stream, fmt)
+    for line, message in report['errors']:
+        print(f"Line {line}: {message}")
+    print(f"{report['created']} cars created, {report['updated']} updated, {report['failed']} failed.")
+
+
+@app.cli.command('seed-cars')
+def seed_cars_command():
+    """Add the demo car catalog, skipping cars that already exist."""
+    added = seed_demo_cars()
+    print(f"{added} demo cars added.")
 
 
 # ============================================
@@ -0,0 +1,60 @@
+"""
+Cold-start benchmark for Prestige Motors
+Times how long a fresh interpreter takes to import the app, the way each
+gunicorn worker does on boot, and checks that the import did no database work.
+
+Usage: python bench_startup.py [runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+IMPORT_SNIPPET = (
+    "import time\n"
+    "start = time.perf_counter()\n"
+    "import app\n"
+    "print(time.perf_counter() - start)\n"
+)
+
+
+def run_once(env):
+    """Import the app in a new interpreter, returning (import seconds, process seconds)"""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', IMPORT_SNIPPET], cwd=PROJECT_DIR, env=env,
+                            capture_output=True, text=True, check=True)
+    elapsed = time.perf_counter() - start
+    return float(result.stdout.strip().splitlines()[-1]), elapsed
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        env = dict(os.environ, DATABASE_URL=f'sqlite:///{db_path}')
+
+        # Warm-up run so bytecode compilation is not counted
+        run_once(env)
+        samples = [run_once(env) for _ in range(runs)]
+
+        imports = [s[0] * 1000 for s in samples]
+        processes = [s[1] * 1000 for s in samples]
+
+        print(f"Cold start over {runs} runs (ms):")
+        print(f"  import app   min {min(imports):7.1f}  median {statistics.median(imports):7.1f}  max {max(imports):7.1f}")
+        print(f"  process      min {min(processes):7.1f}  median {statistics.median(processes):7.1f}  max {max(processes):7.1f}")
+
+        if os.path.exists(db_path):
+            print("FAIL: importing app touched the database")
+            sys.exit(1)
+        print("OK: importing app did no database work")
+
+
+if __name__ == '__main__':
+    main()
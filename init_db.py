@@ -3,7 +3,7 @@ Database initialization script for Prestige Motors
 Run this script to set up the database and create sample data
 """
 
-from app import app, db, User, Car, bcrypt
+from app import app, db, User, Car, bcrypt, migrate
 
 def reset_database():
     """Drop all tables and recreate them"""
@@ -11,7 +11,7 @@ def reset_database():
         print("Dropping all tables...")
         db.drop_all()
         print("Creating all tables...")
-        db.create_all()
+        migrate()
         print("Database structure created successfully!")
 
 def create_admin_user():